@@ -0,0 +1,65 @@
+import time
+from typing import Dict
+
+from core.metrics import (
+    db_round_trips,
+    http_in_flight,
+    http_request_duration,
+    http_requests,
+    start_request_tracking,
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI (sans BaseHTTPMiddleware, pour limiter le surcoût) :
+    latence, statut et allers-retours base par route. La route est le
+    gabarit (/movies/movie/{id}) et non le chemin, pour borner le nombre
+    de séries.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Dict = {}
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is endpoint:
+                    path = route.path
+                    break
+            else:
+                path = "unmatched"
+            self._route_paths[endpoint] = path
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        round_trips = start_request_tracking()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec()
+            route = self._route(scope)
+            method = scope["method"]
+            http_requests.inc(method, route, str(status))
+            http_request_duration.observe(elapsed, method, route)
+            db_round_trips.observe(round_trips[0], route)
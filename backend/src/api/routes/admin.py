@@ -0,0 +1,51 @@
+import asyncio
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+
+from api.routes.dependencies import get_admin_user
+from db.pool import get_async_session_pool, get_session_pool
+from db.query_log import get_query_log
+from services.cache import get_cache_stats, invalidate_all
+
+# Statistiques internes, texte SQL et invalidations : administrateurs seulement
+router = APIRouter(dependencies=[Depends(get_admin_user)])
+
+
+@router.get("/pool")
+async def get_pool_stats():
+    """Statistiques des pools de sessions Oracle"""
+    return {
+        "sync": get_session_pool().stats(),
+        "async": get_async_session_pool().stats(),
+    }
+
+
+@router.get("/cache")
+async def get_cache_statistics():
+    """Compteurs des caches applicatifs (hits, misses, évictions, taille)"""
+    # Les backends SQLite/Redis comptent leurs entrées par une requête
+    return await asyncio.to_thread(get_cache_stats)
+
+
+@router.post("/cache/invalidate")
+async def invalidate_cache(tags: List[str] = Query(...)):
+    """Invalide des tags (ex. film:42 après une correction du catalogue)"""
+    return {"tags": tags, "removed": await invalidate_all(*tags)}
+
+
+@router.get("/queries")
+async def get_top_queries(
+    limit: int = Query(20, ge=1, le=500),
+    order: str = Query("total", regex="^(total|mean|max|count)$"),
+):
+    """Empreintes SQL les plus coûteuses (temps cumulé, moyen, max ou nombre)"""
+    query_log = get_query_log()
+    return {**query_log.stats(), "queries": query_log.top(limit, order)}
+
+
+@router.post("/queries/reset")
+async def reset_query_stats():
+    """Remet à zéro les agrégats par empreinte"""
+    get_query_log().reset()
+    return {"detail": "Query statistics reset"}
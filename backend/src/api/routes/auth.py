@@ -1,6 +1,7 @@
 # backend/src/api/routes/auth.py
 from fastapi import APIRouter, Depends, HTTPException
 from models.schemas.user import ClientLogin, TokenResponse
+from services.passwords import HasherBusyError
 from services.users import UserService
 from core.security import create_token
 
@@ -10,9 +11,14 @@ router = APIRouter()
 @router.post("/login", response_model=TokenResponse)
 async def login_client(credentials: ClientLogin):
     service = UserService()
-    client, is_correct = service.authenticate(
-        credentials.courriel, credentials.mot_de_passe
-    )
+    try:
+        client, is_correct = await service.authenticate(
+            credentials.courriel, credentials.mot_de_passe
+        )
+    except HasherBusyError:
+        raise HTTPException(
+            status_code=503, detail="Service occupé", headers={"Retry-After": "1"}
+        )
 
     if not client or not is_correct:
         raise HTTPException(status_code=401, detail="Identifiants invalides")
@@ -0,0 +1,64 @@
+from typing import Any, Iterable, Optional, Tuple, Type
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from core.config import get_app_config
+from core.encoding import EncodedJSON, dumps, validate_encoded
+
+config = get_app_config()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparaison faible de If-None-Match (RFC 9110) avec l'ETag courant"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _encoded(content: Any, model: Optional[Type[Any]]) -> EncodedJSON:
+    if isinstance(content, EncodedJSON):
+        # Corps servi depuis le cache : validé seulement en DEBUG
+        if config.DEBUG and model is not None:
+            validate_encoded(content, model)
+        return content
+    return EncodedJSON(dumps(jsonable_encoder(content)))
+
+
+def json_response(content: Any, model: Optional[Type[Any]] = None) -> Response:
+    """Réponse JSON brute, sans passer par response_model"""
+    encoded = _encoded(content, model)
+    return Response(content=encoded.body, media_type="application/json")
+
+
+def cached_json_response(
+    request: Request, content: Any, max_age: int, model: Optional[Type[Any]] = None
+) -> Response:
+    """
+    Réponse JSON avec Cache-Control et ETag ; 304 sans corps si le client
+    possède déjà cette version.
+    """
+    encoded = _encoded(content, model)
+    headers = {"ETag": encoded.etag, "Cache-Control": f"public, max-age={max_age}"}
+    if etag_matches(request.headers.get("if-none-match"), encoded.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=encoded.body, media_type="application/json", headers=headers)
+
+
+def canonical_query_string(params: Iterable[Tuple[str, str]]) -> str:
+    """
+    Forme canonique d'une query string : clés triées, valeurs répétées
+    triées et dédoublonnées, paramètres vides retirés. Deux recherches
+    équivalentes partagent ainsi la même URL dans les caches HTTP.
+    """
+    pairs = sorted({(key, value) for key, value in params if value != ""})
+    return urlencode(pairs)
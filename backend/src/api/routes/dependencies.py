@@ -1,31 +1,39 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from core.security import verify_token, get_email_from_token
+from core.config import get_app_config
+from core.security import get_email_from_token
 
 security = HTTPBearer()
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> str:
     """
-    Dépendance FastAPI pour récupérer l'utilisateur actuel à partir du token JWT
+    Dépendance FastAPI pour récupérer l'utilisateur actuel à partir du token JWT.
+    Asynchrone (pas de passage par le pool de threads) : le token n'est
+    décodé qu'une fois, puis servi par le cache des tokens vérifiés.
     """
-    try:
-        token = credentials.credentials
-        if not verify_token(token):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token invalide"
-            )
+    email = get_email_from_token(credentials.credentials)
+    if not email:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token invalide"
+        )
+    return email
 
-        email = get_email_from_token(token)
-        if not email:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token invalide"
-            )
 
-        return email
-    except Exception as e:
+async def get_admin_user(current_user: str = Depends(get_current_user)) -> str:
+    """
+    Dépendance des routes /admin : utilisateur connecté et présent dans
+    ADMIN_EMAILS (liste vide : aucun accès)
+    """
+    admins = {
+        email.strip().lower()
+        for email in get_app_config().ADMIN_EMAILS.split(",")
+        if email.strip()
+    }
+    if current_user.lower() not in admins:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Non autorisé"
+            status_code=status.HTTP_403_FORBIDDEN, detail="Accès réservé aux administrateurs"
         )
+    return current_user
@@ -0,0 +1,75 @@
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from core.metrics import registry
+from db.pool import get_async_session_pool, get_session_pool
+from services.cache import get_cache_stats
+from services.passwords import get_password_hasher
+
+router = APIRouter()
+
+# Compteurs des caches exposés tels quels, avec leur type Prometheus
+CACHE_COUNTERS = (
+    "hits", "misses", "errors", "coalesced", "invalidations",
+    "stale_hits", "refreshes", "refresh_errors", "evictions", "expirations",
+)
+CACHE_GAUGES = ("hit_ratio", "entries", "bytes")
+POOL_COUNTERS = ("acquired", "waits", "timeouts")
+POOL_GAUGES = ("busy", "open", "max")
+
+
+def _collect_caches():
+    stats = get_cache_stats()
+    for field in CACHE_COUNTERS + CACHE_GAUGES:
+        kind = "counter" if field in CACHE_COUNTERS else "gauge"
+        suffix = "_total" if kind == "counter" else ""
+        yield (
+            f"cache_{field}{suffix}",
+            kind,
+            f"CacheService: {field}",
+            [({"cache": name}, values[field]) for name, values in stats.items() if field in values],
+        )
+
+
+def _collect_pools():
+    pools = {"sync": get_session_pool().stats(), "async": get_async_session_pool().stats()}
+    for field in POOL_COUNTERS + POOL_GAUGES:
+        kind = "counter" if field in POOL_COUNTERS else "gauge"
+        suffix = "_total" if kind == "counter" else ""
+        yield (
+            f"db_pool_{field}{suffix}",
+            kind,
+            f"Pool de sessions: {field}",
+            [({"pool": name}, values[field]) for name, values in pools.items()],
+        )
+    yield (
+        "db_pool_wait_seconds_total",
+        "counter",
+        "Pool de sessions: temps d'attente cumulé",
+        [({"pool": name}, values["wait_time_ms"] / 1000) for name, values in pools.items()],
+    )
+
+
+def _collect_password_hasher():
+    stats = get_password_hasher().stats()
+    for name, kind, field, documentation in (
+        ("password_hash_pending", "gauge", "pending", "Hachages de mots de passe en cours"),
+        ("password_hash_rejected_total", "counter", "rejected", "Hachages refusés (file pleine)"),
+        ("password_rehashed_total", "counter", "rehashed", "Mots de passe réécrits à la connexion"),
+    ):
+        yield (name, kind, documentation, [({}, stats[field])])
+
+
+registry.register_collector(_collect_caches)
+registry.register_collector(_collect_pools)
+registry.register_collector(_collect_password_hasher)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Métriques au format texte Prometheus"""
+    # Collecteurs synchrones (statistiques des backends de cache) : hors de l'event loop
+    body = await asyncio.to_thread(registry.render)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
@@ -1,7 +1,19 @@
-from typing import List
+import csv
+import io
+from typing import AsyncIterator, Callable, Dict, List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import RedirectResponse, StreamingResponse
+from pydantic import ValidationError
+from pydantic.fields import SHAPE_SINGLETON
 
+from api.routes.caching import (
+    cached_json_response,
+    canonical_query_string,
+    json_response,
+)
+from core.config import get_app_config
+from core.encoding import dumps
 from core.security import create_token, get_email_from_token, verify_token
 from models.schemas.movie import (
     MovieBase,
@@ -14,6 +26,15 @@ from services.movies import MovieService
 
 router = APIRouter()
 service = MovieService()
+config = get_app_config()
+
+MAX_BATCH_IDS = 100
+
+EXPORT_COLUMNS = ["ID", "TITRE", "ANNEE", "LANGUE", "DUREE", "POSTER_URL", "RESUME"]
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "films.ndjson"),
+    "csv": ("text/csv", "films.csv"),
+}
 
 
 @router.post("/", response_model=MoviesPaginatedResponse)
@@ -21,56 +42,200 @@ async def search_movies(movie: MovieRequest):
     """Search for movies"""
     # print("Searching for movies", movie)
     # print("Received search request:", movie.dict())
-    result = service.search_movies(movie)
+    try:
+        result = await service.search_movies_json(movie)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     # print("Sending to db", result)
 
     if not result:
         raise HTTPException(status_code=401, detail="No movies found")
-    return result
+    return json_response(result, MoviesPaginatedResponse)
+
+
+def _search_request_from_query(request: Request) -> MovieRequest:
+    params = {}
+    for name, field in MovieRequest.__fields__.items():
+        if field.shape != SHAPE_SINGLETON:
+            values = request.query_params.getlist(name)
+            if values:
+                params[name] = values
+        elif name in request.query_params:
+            params[name] = request.query_params[name]
+    try:
+        return MovieRequest.parse_obj(params)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+
+
+@router.get("/search", response_model=MoviesPaginatedResponse)
+async def search_movies_get(request: Request):
+    """
+    Search for movies (cacheable GET variant of POST /movies/).
+    List criteria are repeated: ?GENRES_INCLUS=Action&GENRES_INCLUS=Drame
+    """
+    canonical = canonical_query_string(request.query_params.multi_items())
+    if canonical != request.url.query:
+        # Une seule URL par recherche : les caches HTTP la partagent
+        return RedirectResponse(
+            f"{request.url.path}?{canonical}" if canonical else request.url.path,
+            status_code=301,
+        )
+
+    movie = _search_request_from_query(request)
+    try:
+        result = await service.search_movies_json(movie)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not result:
+        raise HTTPException(status_code=401, detail="No movies found")
+    return cached_json_response(
+        request, result, config.HTTP_SEARCH_MAX_AGE, MoviesPaginatedResponse
+    )
+
+
+async def _ndjson_chunks(batches: AsyncIterator[List[Dict]]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(dumps(movie) + b"\n" for movie in batch)
+
+
+async def _csv_chunks(batches: AsyncIterator[List[Dict]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    async for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ExportResponse(StreamingResponse):
+    """Rend le créneau d'export même si la réponse n'est jamais diffusée"""
+
+    def __init__(self, content, release: Callable[[], None], **kwargs):
+        super().__init__(content, **kwargs)
+        self.release = release
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # Flux annulé (client parti) : un générateur suspendu est fermé ici,
+            # un générateur en cours se ferme en propageant l'annulation
+            if not self.body_iterator.ag_running:
+                await self.body_iterator.aclose()
+            self.release()
+
+
+async def _export_chunks(
+    batches: AsyncIterator[List[Dict]], format: str, release: Callable[[], None]
+) -> AsyncIterator[bytes]:
+    chunks = _csv_chunks(batches) if format == "csv" else _ndjson_chunks(batches)
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await chunks.aclose()
+        await batches.aclose()
+        release()
+
+
+@router.get("/export")
+async def export_movies(request: Request, format: str = Query("ndjson")):
+    """
+    Export of every movie matching the search criteria (same query
+    parameters as /movies/search, pagination ignored), streamed as NDJSON
+    or CSV while rows are fetched: memory use does not depend on the
+    result size, and a slow client slows down the fetch.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    movie = _search_request_from_query(request)
+
+    # Créneau pris ici, avant la réponse : la limite donne un 503 immédiat
+    # au lieu d'une attente une fois le flux ouvert
+    if not service.acquire_export():
+        raise HTTPException(
+            status_code=503, detail="Too many exports in progress", headers={"Retry-After": "5"}
+        )
+    released = False
+
+    def release():
+        nonlocal released
+        if not released:
+            released = True
+            service.release_export()
+
+    media_type, filename = EXPORT_FORMATS[format]
+    return _ExportResponse(
+        _export_chunks(service.export_movies(movie), format, release),
+        release,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/movie/{id}", response_model=MovieBase)
-async def get_movie(id: int):
+async def get_movie(id: int, request: Request):
     """Get a movie by its ID"""
-    result = service.get_movie(id)
+    result = await service.get_movie_json(id)
     if not result:
         raise HTTPException(status_code=401, detail="Movie not found")
-    return result
+    return cached_json_response(request, result, config.HTTP_MOVIE_MAX_AGE, MovieBase)
+
+
+@router.get("/batch", response_model=List[MovieBase])
+async def get_movies_batch(request: Request, ids: List[int] = Query(...)):
+    """Get several movies by their IDs in constant round trips"""
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request"
+        )
+    result = await service.get_movies(ids)
+    if not result:
+        raise HTTPException(status_code=404, detail="Movies not found")
+    return cached_json_response(
+        request, [MovieBase(**film) for film in result], config.HTTP_MOVIE_MAX_AGE
+    )
 
 
 @router.get("/movie/{id}/trailer")
-async def get_movie_trailer(id: int):
+async def get_movie_trailer(id: int, request: Request):
     """Get a movie trailer by its ID"""
-    result = service.get_movie_trailer(id)
+    result = await service.get_movie_trailer(id)
     print("Result", result)
     if not result:
         raise HTTPException(status_code=404, detail="Trailer not found")
-    return result
+    return cached_json_response(request, result, config.HTTP_MOVIE_MAX_AGE)
 
 
 @router.get("/suggestions/{term}")
-async def get_suggestions(term: str):
+async def get_suggestions(term: str, request: Request):
     """Get movie suggestions"""
-    result = service.get_suggestions(term)
+    result = await service.get_suggestions(term)
     if not result:
         raise HTTPException(status_code=401, detail="No suggestions found")
-    return result
+    return cached_json_response(request, result, config.HTTP_SUGGESTIONS_MAX_AGE)
 
 
 @router.get("/all-genres")
-async def get_genres():
+async def get_genres(request: Request):
     """Get all genres"""
-    result = service.get_genres()
+    result = await service.get_genres()
     if not result:
         raise HTTPException(status_code=401, detail="No genres found")
-    return result
+    return cached_json_response(request, result, config.HTTP_GENRES_MAX_AGE)
 
 
 @router.get("/scenariste/{nom_scenariste}", response_model=List[MovieBase])
 async def get_movies_by_scenariste(nom_scenariste: str):
     """Get movies by scenariste name"""
     try:
-        result = service.get_movies_by_scenariste(nom_scenariste)
+        result = await service.get_movies_by_scenariste(nom_scenariste)
         if not result:
             raise HTTPException(
                 status_code=404, detail="No movies found for this scenariste"
@@ -81,26 +246,30 @@ async def get_movies_by_scenariste(nom_scenariste: str):
 
 
 @router.get("/actor/suggestion/{term}", response_model=NameSuggestionResponse)
-async def get_actor_suggestions(term: str):
+async def get_actor_suggestions(term: str, request: Request):
     """Get actor or director name suggestions"""
     try:
-        result = service.get_actor_suggestions(term)
+        result = await service.get_actor_suggestions(term)
         if not result:
             raise HTTPException(status_code=404, detail="No suggestions found")
 
         name_suggestions = [
             NameSuggestion(id=item["ID"], name=item["NOM"]) for item in result
         ]
-        return NameSuggestionResponse(suggestions=name_suggestions)
+        return cached_json_response(
+            request,
+            NameSuggestionResponse(suggestions=name_suggestions),
+            config.HTTP_SUGGESTIONS_MAX_AGE,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/director/suggestion/{term}", response_model=NameSuggestionResponse)
-async def get_scenarist_suggestions(term: str):
+async def get_scenarist_suggestions(term: str, request: Request):
     """Get director name suggestions"""
     try:
-        result = service.get_scenarist_suggestions(term)
+        result = await service.get_scenarist_suggestions(term)
         if not result:
             raise HTTPException(status_code=404, detail="No suggestions found")
 
@@ -108,6 +277,10 @@ async def get_scenarist_suggestions(term: str):
         name_suggestions = [
             NameSuggestion(id=int(item["ID"]), name=item["NOM"]) for item in result
         ]
-        return NameSuggestionResponse(suggestions=name_suggestions)
+        return cached_json_response(
+            request,
+            NameSuggestionResponse(suggestions=name_suggestions),
+            config.HTTP_SUGGESTIONS_MAX_AGE,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
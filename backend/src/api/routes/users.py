@@ -1,7 +1,8 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from models.schemas.movie import MovieResponse
-from models.schemas.user import ClientLogin, TokenResponse, ClientBase, ClientCreate, ClientResponse, ClientUpdate
+from models.schemas.user import ClientLogin, TokenResponse, ClientBase, ClientCreate, ClientResponse, ClientUpdate, RentRequest, RentResponse
+from services.passwords import HasherBusyError
 from services.users import UserService
 from core.security import create_token, verify_token, get_email_from_token
 from api.routes.dependencies import get_current_user
@@ -19,7 +20,7 @@ service = UserService()
 )
 async def get_current_client(current_user: str = Depends(get_current_user)):
     """Récupère le profil du client connecté"""
-    client = service.get_profile(current_user)
+    client = await service.get_profile(current_user)
 
     if not client:
         raise HTTPException(status_code=401, detail="Client non trouvé")
@@ -31,7 +32,7 @@ async def patch_myaccount(
     current_user: str = Depends(get_current_user),
 ):
     service = UserService()
-    success = service.update_profile(current_user, updates.dict(exclude_unset=True))
+    success = await service.update_profile(current_user, updates.dict(exclude_unset=True))
     if not success:
         raise HTTPException(status_code=400, detail="Unable to update profile")
     return {"detail": "Profile updated"}
@@ -39,10 +40,15 @@ async def patch_myaccount(
 @router.post("/auth/register")
 async def register_client(client: ClientCreate):
     """Enregistre un nouveau client"""
-    result = service.register_client(client)
-    if not result:
+    try:
+        result = await service.register_client(client)
+    except HasherBusyError:
+        raise HTTPException(
+            status_code=503, detail="Service occupé", headers={"Retry-After": "1"}
+        )
+    if result is None:
         raise HTTPException(status_code=401, detail="L'enregistrement a échoué")
-    return result
+    return {"id": result}
 
 @router.post("/rent/{film_id}")
 async def rent_movie(
@@ -50,27 +56,33 @@ async def rent_movie(
     current_user: str = Depends(get_current_user),
 ):
     """
-    Redeems credits and associates the client with the specified film.
+    Redeems credits and associates the client with the specified film,
+    in a single transaction.
     """
-    service = UserService()
-
-    success = service.redeem_credits(current_user)
-    if not success:
-        raise HTTPException(status_code=400, detail="Unable to redeem credits")
+    new_credits = await service.rent_film(current_user, film_id)
+    if new_credits is None:
+        raise HTTPException(status_code=400, detail="Unable to rent film")
 
-    link_success = service.link_film_to_client(current_user, film_id)
-    if not link_success:
-        raise HTTPException(status_code=400, detail="Unable to link film to client")
+    return {"credits": new_credits}
 
-    new_credits = service.get_user_credits(current_user)
-    if new_credits < 0:
-        raise HTTPException(status_code=400, detail="Unable to get user credits")
+@router.post("/rent", response_model=RentResponse)
+async def rent_movies(
+    cart: RentRequest,
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Rents every film of the cart in a single transaction; films the client
+    already rented (or unknown IDs) are skipped and not charged.
+    """
+    result = await service.rent_films(current_user, cart.films)
+    if result is None:
+        raise HTTPException(status_code=400, detail="Unable to rent films")
 
-    return {"credits": new_credits}
+    return result
 
 @router.get("/rented-movies", response_model=List[MovieResponse])
 async def get_rented_movies_route(current_user: str = Depends(get_current_user)):
     service = UserService()
-    movies = service.get_rented_movies(current_user)
+    movies = await service.get_rented_movies(current_user)
     return movies
 
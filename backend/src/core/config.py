@@ -14,17 +14,79 @@ class DatabaseConfig:
     password: str
     service_name: str
 
+    # oracle | sqlite (bancs d'essai et tests locaux)
+    backend: str = "oracle"
+    sqlite_path: str = "/tmp/film-location.db"
+
+    # Pool de sessions
+    pool_min: int = 2
+    pool_max: int = 10
+    pool_increment: int = 1
+    pool_timeout: int = 5000  # ms d'attente max pour obtenir une session
+    pool_ping_interval: int = 60  # s d'inactivité avant un ping de vérification
+    pool_idle_timeout: int = 300  # s avant la fermeture d'une session inactive
+    stmt_cache_size: int = 50  # instructions préparées gardées par session
+
 
 @dataclass
 class AppConfig:
     # API Config
     API_VERSION: str = "1.0.0"
-    DEBUG: bool = False
+    DEBUG: bool = os.getenv("DEBUG", "false").lower() in ("1", "true")
 
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key")
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Courriels des clients ayant accès aux routes /admin (séparés par des virgules)
+    ADMIN_EMAILS: str = os.getenv("ADMIN_EMAILS", "")
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+
+    # Cache applicatif
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    CACHE_SWEEP_SECONDS: int = int(os.getenv("CACHE_SWEEP_SECONDS", 60))
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_SQLITE_PATH: str = os.getenv("CACHE_SQLITE_PATH", "/tmp/film-location-cache.db")
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_INVALIDATION_PATH: str = os.getenv(
+        "CACHE_INVALIDATION_PATH", "/tmp/film-location-invalidations.db"
+    )
+    CACHE_INVALIDATION_POLL_SECONDS: float = float(
+        os.getenv("CACHE_INVALIDATION_POLL_SECONDS", 1)
+    )
+    CACHE_PROFILE_MINUTES: int = int(os.getenv("CACHE_PROFILE_MINUTES", 1440))
+    CACHE_STALE_MINUTES: int = int(os.getenv("CACHE_STALE_MINUTES", 1440))
+    CACHE_STALE_GRACE_MINUTES: int = int(os.getenv("CACHE_STALE_GRACE_MINUTES", 60))
+
+    # Cache HTTP (Cache-Control: max-age, en secondes)
+    HTTP_MOVIE_MAX_AGE: int = int(os.getenv("HTTP_MOVIE_MAX_AGE", 300))
+    HTTP_SEARCH_MAX_AGE: int = int(os.getenv("HTTP_SEARCH_MAX_AGE", 60))
+    HTTP_GENRES_MAX_AGE: int = int(os.getenv("HTTP_GENRES_MAX_AGE", 3600))
+    HTTP_SUGGESTIONS_MAX_AGE: int = int(os.getenv("HTTP_SUGGESTIONS_MAX_AGE", 300))
+
+    # Journal des requêtes SQL lentes
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", 250))
+    QUERY_LOG_MAX_FINGERPRINTS: int = int(os.getenv("QUERY_LOG_MAX_FINGERPRINTS", 1000))
+
+    # Dictionnaire des genres
+    GENRES_REFRESH_SECONDS: int = int(os.getenv("GENRES_REFRESH_SECONDS", 3600))
+
+    # Autocomplétion
+    SUGGESTIONS_REFRESH_SECONDS: int = int(os.getenv("SUGGESTIONS_REFRESH_SECONDS", 60))
+    SUGGESTIONS_RELOAD_SECONDS: int = int(os.getenv("SUGGESTIONS_RELOAD_SECONDS", 3600))
+
+    # Mots de passe (hachage sur un pool de threads dédié)
+    PASSWORD_SCHEME: str = os.getenv("PASSWORD_SCHEME", "bcrypt")
+    PASSWORD_BCRYPT_ROUNDS: int = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_QUEUE: int = int(os.getenv("PASSWORD_HASH_QUEUE", 32))
+
+    # Export en flux (GET /movies/export)
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+    EXPORT_MAX_CONCURRENT: int = int(os.getenv("EXPORT_MAX_CONCURRENT", 2))
+
+    # Location
+    RENTAL_COST: int = int(os.getenv("RENTAL_COST", 10))
 
     # Database
     DB_HOST: str = os.getenv("ORACLE_HOST")
@@ -48,4 +110,13 @@ def get_database_config() -> DatabaseConfig:
         user=os.getenv("ORACLE_USER"),
         password=os.getenv("ORACLE_PASSWORD"),
         service_name=os.getenv("ORACLE_SERVICE"),
+        backend=os.getenv("DB_BACKEND", "oracle"),
+        sqlite_path=os.getenv("SQLITE_PATH", "/tmp/film-location.db"),
+        pool_min=int(os.getenv("ORACLE_POOL_MIN", 2)),
+        pool_max=int(os.getenv("ORACLE_POOL_MAX", 10)),
+        pool_increment=int(os.getenv("ORACLE_POOL_INCREMENT", 1)),
+        pool_timeout=int(os.getenv("ORACLE_POOL_TIMEOUT_MS", 5000)),
+        pool_ping_interval=int(os.getenv("ORACLE_POOL_PING_INTERVAL", 60)),
+        pool_idle_timeout=int(os.getenv("ORACLE_POOL_IDLE_TIMEOUT", 300)),
+        stmt_cache_size=int(os.getenv("ORACLE_STMT_CACHE_SIZE", 50)),
     )
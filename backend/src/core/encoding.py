@@ -0,0 +1,56 @@
+import hashlib
+from typing import Any, Optional, Type
+
+import orjson
+from pydantic import BaseModel, parse_obj_as, parse_raw_as
+
+
+def make_etag(body: bytes) -> str:
+    """ETag fort dérivé du contenu de la réponse"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class EncodedJSON:
+    """
+    Corps JSON déjà encodé et son ETag : mis en cache tel quel, il est
+    renvoyé sans nouvelle validation ni sérialisation.
+    """
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes, etag: Optional[str] = None):
+        self.body = body
+        self.etag = etag or make_etag(body)
+
+    def __getstate__(self):
+        return (self.body, self.etag)
+
+    def __setstate__(self, state):
+        self.body, self.etag = state
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.dict()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default)
+
+
+def encode_json(content: Any, model: Optional[Type[Any]] = None) -> EncodedJSON:
+    """
+    Encode une réponse une seule fois. Avec `model`, les données passent
+    d'abord par le schéma (mêmes champs que response_model).
+    """
+    if model is not None:
+        content = parse_obj_as(model, content)
+    return EncodedJSON(dumps(content))
+
+
+def validate_encoded(encoded: EncodedJSON, model: Type[Any]):
+    """Revalide un corps en cache contre son schéma (mode DEBUG)"""
+    parse_raw_as(model, encoded.body)
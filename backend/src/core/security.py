@@ -1,4 +1,8 @@
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import threading
+import time
+from typing import Dict, Optional
 import jwt
 from dotenv import load_dotenv
 import os
@@ -13,30 +17,80 @@ ALGORITHM = os.getenv("ALGORITHM")
 if ALGORITHM is None:
     ALGORITHM = "HS256"
 
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+# Tokens vérifiés gardés en mémoire (LRU)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+
+
+class VerifiedTokenCache:
+    """
+    LRU borné des tokens déjà vérifiés -> claims. Un token n'est vérifié
+    (HMAC) qu'une fois tant qu'il reste en cache ; l'expiration (exp) est
+    contrôlée à chaque lecture.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str, now: float) -> Optional[Dict]:
+        with self._lock:
+            claims = self._entries.get(token)
+            if claims is None:
+                return None
+            if claims["exp"] <= now:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return claims
+
+    def put(self, token: str, claims: Dict):
+        with self._lock:
+            self._entries[token] = claims
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_verified_tokens = VerifiedTokenCache(TOKEN_CACHE_SIZE)
+
 
 def create_token(email: str) -> str:
-    """Créer un token simple"""
+    """Créer un token signé, valable ACCESS_TOKEN_EXPIRE_MINUTES"""
     data = {
         "user_email": email,
-        "expires": str(datetime.utcnow() + timedelta(minutes=30)),
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
     }
 
     token = jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
     return token
 
 
+def decode_token(token: str) -> Optional[Dict]:
+    """Claims du token s'il est valide et non expiré, sinon None (un seul décodage)"""
+    now = time.time()
+    claims = _verified_tokens.get(token, now)
+    if claims is not None:
+        return claims
+    try:
+        claims = jwt.decode(
+            token, SECRET_KEY, algorithms=[ALGORITHM], options={"require": ["exp"]}
+        )
+    except jwt.PyJWTError:
+        return None
+    if not claims.get("user_email"):
+        return None
+    _verified_tokens.put(token, claims)
+    return claims
+
+
 def verify_token(token: str) -> bool:
     """Vérifier si le token est valide"""
-    try:
-        jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return True
-    except:
-        return False
+    return decode_token(token) is not None
 
 
-def get_email_from_token(token: str) -> str:
+def get_email_from_token(token: str) -> Optional[str]:
     """Récupérer l'email du token"""
-    try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])["user_email"]
-    except:
-        return None
+    claims = decode_token(token)
+    return claims["user_email"] if claims else None
@@ -0,0 +1,92 @@
+from typing import Optional, Sequence, Tuple
+
+
+class OracleDialect:
+    """
+    Fragments SQL propres à Oracle. Les repositories composent leurs
+    requêtes avec ces méthodes pour rester exécutables sur SQLite.
+    """
+
+    name = "oracle"
+    # RETURNING ... INTO : valeurs lues dans des variables de sortie
+    out_binds = True
+
+    def limit(self, param: str = "limit") -> str:
+        return f"FETCH FIRST :{param} ROWS ONLY"
+
+    def offset_limit(self, offset: str = "offset", limit: str = "limit") -> str:
+        return f"OFFSET :{offset} ROWS FETCH NEXT :{limit} ROWS ONLY"
+
+    def json_ids(self, param: str) -> str:
+        """Sous-requête des ID d'une liste JSON liée en une seule variable"""
+        return (
+            f"SELECT ID FROM JSON_TABLE(:{param}, '$[*]' COLUMNS (ID NUMBER PATH '$'))"
+        )
+
+    def json_strings(self, param: str) -> str:
+        """Sous-requête (colonne VAL) des chaînes d'une liste JSON liée"""
+        return (
+            f"SELECT VAL FROM JSON_TABLE(:{param}, '$[*]' "
+            f"COLUMNS (VAL VARCHAR2(4000) PATH '$'))"
+        )
+
+    def returning(self, columns: Sequence[str]) -> str:
+        """Clause RETURNING d'un DML (voir AsyncBaseRepository.execute_returning)"""
+        binds = ", ".join(f":out_{c.lower()}" for c in columns)
+        return f"RETURNING {', '.join(columns)} INTO {binds}"
+
+    def json_object(self, pairs: Sequence[Tuple[str, str]]) -> str:
+        return "JSON_OBJECT(" + ", ".join(f"'{k}' VALUE {v}" for k, v in pairs) + ")"
+
+    def json_array(self, expr: str, source: str, order_by: Optional[str] = None) -> str:
+        """
+        Sous-requête scalaire agrégeant `expr` en tableau JSON
+        (`source` : clauses FROM ... WHERE ...).
+        """
+        order = f" ORDER BY {order_by}" if order_by else ""
+        return f"(SELECT JSON_ARRAYAGG({expr}{order} RETURNING CLOB) {source})"
+
+
+class SQLiteDialect(OracleDialect):
+    """Équivalents SQLite (json1, LIMIT/OFFSET)"""
+
+    name = "sqlite"
+    # RETURNING renvoie un jeu de résultats (SQLite >= 3.35)
+    out_binds = False
+
+    def limit(self, param: str = "limit") -> str:
+        return f"LIMIT :{param}"
+
+    def offset_limit(self, offset: str = "offset", limit: str = "limit") -> str:
+        return f"LIMIT :{limit} OFFSET :{offset}"
+
+    def json_ids(self, param: str) -> str:
+        return f"SELECT value FROM json_each(:{param})"
+
+    def json_strings(self, param: str) -> str:
+        return f"SELECT value AS VAL FROM json_each(:{param})"
+
+    def returning(self, columns: Sequence[str]) -> str:
+        return f"RETURNING {', '.join(columns)}"
+
+    def json_object(self, pairs: Sequence[Tuple[str, str]]) -> str:
+        return "json_object(" + ", ".join(f"'{k}', {v}" for k, v in pairs) + ")"
+
+    def json_array(self, expr: str, source: str, order_by: Optional[str] = None) -> str:
+        if order_by:
+            # Pas d'ORDER BY dans les agrégats : on agrège une sous-requête triée
+            return (
+                f"(SELECT json_group_array(V) FROM "
+                f"(SELECT {expr} AS V {source} ORDER BY {order_by}))"
+            )
+        return f"(SELECT json_group_array({expr}) {source})"
+
+
+DIALECTS = {"oracle": OracleDialect, "sqlite": SQLiteDialect}
+
+
+def get_dialect(name: str) -> OracleDialect:
+    try:
+        return DIALECTS[name.lower()]()
+    except KeyError:
+        raise ValueError(f"Unknown database backend: {name}")
@@ -0,0 +1,2 @@
+-- Index de la pagination par clé (TITRE, ID) de search_films
+CREATE INDEX FILMS_TITRE_ID_IX ON FILMS (TITRE, ID);
@@ -0,0 +1,3 @@
+-- Filtre par ID_GENRE de search_films : parcours d'index (ID_GENRE, ID_FILM)
+-- puis GROUP BY ID_FILM, sans lire la table FILM_GENRE ni joindre GENRES.
+CREATE INDEX FILM_GENRE_GENRE_FILM_IX ON FILM_GENRE (ID_GENRE, ID_FILM);
@@ -0,0 +1,4 @@
+-- Filtres ACTEUR_IDS / SCENARISTE_IDS de search_films : parcours d'index
+-- par personne puis GROUP BY ID_FILM, sans lire les tables de liaison.
+CREATE INDEX ROLES_ACTEUR_FILM_IX ON ROLES (ID_ACTEUR, ID_FILM);
+CREATE INDEX FILM_SCENARISTES_SCEN_FILM_IX ON FILM_SCENARISTES (ID_SCENARISTE, ID_FILM);
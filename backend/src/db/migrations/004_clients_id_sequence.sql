@@ -0,0 +1,14 @@
+-- ID des clients attribués par une séquence (blocs de 100 en cache)
+-- au lieu de SELECT MAX(ID) + 1 : plus d'aller-retour préalable ni de
+-- doublon quand deux inscriptions arrivent en même temps.
+DECLARE
+    next_id NUMBER;
+BEGIN
+    SELECT NVL(MAX(ID), 0) + 1 INTO next_id FROM CLIENTS;
+    EXECUTE IMMEDIATE
+        'CREATE SEQUENCE CLIENTS_SEQ START WITH ' || next_id || ' CACHE 100';
+END;
+/
+
+-- Les INSERT omettent ID et le récupèrent par RETURNING ID INTO
+ALTER TABLE CLIENTS MODIFY ID DEFAULT CLIENTS_SEQ.NEXTVAL;
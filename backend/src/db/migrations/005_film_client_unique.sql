@@ -0,0 +1,28 @@
+-- Un film n'est lié qu'une fois à un client : une location en double
+-- (paniers concurrents, nouvel essai) est rejetée par la base.
+--
+-- Les doublons existants sont des locations payées : ils sont copiés dans
+-- FILM_CLIENT_DOUBLONS (date d'archivage en plus) avant d'être retirés,
+-- pour vérification et remboursement éventuel. La table est verrouillée
+-- pendant la copie et la suppression : aucun doublon ne peut être retiré
+-- sans avoir été archivé.
+CREATE TABLE FILM_CLIENT_DOUBLONS AS
+SELECT FC.*, SYSTIMESTAMP AS ARCHIVE_LE FROM FILM_CLIENT FC WHERE 1 = 0;
+
+LOCK TABLE FILM_CLIENT IN EXCLUSIVE MODE;
+
+INSERT INTO FILM_CLIENT_DOUBLONS
+SELECT FC.*, SYSTIMESTAMP FROM FILM_CLIENT FC
+WHERE FC.ROWID NOT IN (
+    SELECT MIN(ROWID) FROM FILM_CLIENT GROUP BY ID_FILM, ID_CLIENT
+);
+
+DELETE FROM FILM_CLIENT
+WHERE ROWID NOT IN (
+    SELECT MIN(ROWID) FROM FILM_CLIENT GROUP BY ID_FILM, ID_CLIENT
+);
+
+COMMIT;
+
+-- Échoue (ORA-02299) si un doublon a été inséré depuis le COMMIT
+ALTER TABLE FILM_CLIENT ADD CONSTRAINT FILM_CLIENT_UK UNIQUE (ID_FILM, ID_CLIENT);
@@ -0,0 +1,200 @@
+import threading
+import time
+from typing import Dict, Optional
+
+import oracledb
+from core.config import DatabaseConfig, get_database_config
+from db.dialects import OracleDialect, get_dialect
+from db.sqlite import AsyncSQLiteSessionPool, SQLiteSessionPool
+
+# Les CLOB (RESUME, ...) sont lus directement comme des str
+oracledb.defaults.fetch_lobs = False
+
+
+class SessionPool:
+    """
+    Pool de sessions Oracle partagé par tout le processus.
+    Remplace l'ouverture d'une connexion par requête SQL.
+    """
+
+    def __init__(self, config: DatabaseConfig):
+        self.config = config
+        self._pool: Optional[oracledb.ConnectionPool] = None
+        self._lock = threading.Lock()
+        self._acquired = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+
+    def _create(self) -> oracledb.ConnectionPool:
+        dsn = f"{self.config.host}:{self.config.port}/{self.config.service_name}"
+        return oracledb.create_pool(
+            user=self.config.user,
+            password=self.config.password,
+            dsn=dsn,
+            min=self.config.pool_min,
+            max=self.config.pool_max,
+            increment=self.config.pool_increment,
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=self.config.pool_timeout,
+            ping_interval=self.config.pool_ping_interval,
+            timeout=self.config.pool_idle_timeout,
+            stmtcachesize=self.config.stmt_cache_size,
+        )
+
+    @property
+    def pool(self) -> oracledb.ConnectionPool:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._create()
+        return self._pool
+
+    def acquire(self) -> oracledb.Connection:
+        pool = self.pool
+        # Toutes les sessions sont occupées : l'appelant va attendre
+        waited = pool.busy >= pool.max
+        start = time.perf_counter()
+        try:
+            conn = pool.acquire()
+        except oracledb.Error:
+            with self._lock:
+                self._timeouts += 1
+            raise
+        with self._lock:
+            self._acquired += 1
+            if waited:
+                self._waits += 1
+                self._wait_time += time.perf_counter() - start
+        return conn
+
+    def release(self, conn: oracledb.Connection):
+        self.pool.release(conn)
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close(force=True)
+                self._pool = None
+
+    def stats(self) -> Dict:
+        """Statistiques du pool (sessions occupées/ouvertes, attentes)"""
+        with self._lock:
+            stats = {
+                "backend": "oracle",
+                "min": self.config.pool_min,
+                "max": self.config.pool_max,
+                "increment": self.config.pool_increment,
+                "busy": self._pool.busy if self._pool else 0,
+                "open": self._pool.opened if self._pool else 0,
+                "acquired": self._acquired,
+                "waits": self._waits,
+                "wait_time_ms": round(self._wait_time * 1000, 3),
+                "timeouts": self._timeouts,
+                "stmt_cache_size": self.config.stmt_cache_size,
+            }
+        return stats
+
+
+class AsyncSessionPool(SessionPool):
+    """
+    Pool de sessions asyncio (python-oracledb, mode Thin).
+    Les routes async peuvent attendre la base sans bloquer l'event loop.
+    """
+
+    def _create(self) -> oracledb.AsyncConnectionPool:
+        dsn = f"{self.config.host}:{self.config.port}/{self.config.service_name}"
+        return oracledb.create_pool_async(
+            user=self.config.user,
+            password=self.config.password,
+            dsn=dsn,
+            min=self.config.pool_min,
+            max=self.config.pool_max,
+            increment=self.config.pool_increment,
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=self.config.pool_timeout,
+            ping_interval=self.config.pool_ping_interval,
+            timeout=self.config.pool_idle_timeout,
+            stmtcachesize=self.config.stmt_cache_size,
+        )
+
+    async def acquire(self) -> oracledb.AsyncConnection:
+        pool = self.pool
+        waited = pool.busy >= pool.max
+        start = time.perf_counter()
+        try:
+            conn = await pool.acquire()
+        except oracledb.Error:
+            with self._lock:
+                self._timeouts += 1
+            raise
+        with self._lock:
+            self._acquired += 1
+            if waited:
+                self._waits += 1
+                self._wait_time += time.perf_counter() - start
+        return conn
+
+    async def release(self, conn: oracledb.AsyncConnection):
+        await self.pool.release(conn)
+
+    async def close(self):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await pool.close(force=True)
+
+
+def _is_sqlite(config: DatabaseConfig) -> bool:
+    return config.backend.lower() == "sqlite"
+
+
+_dialect: Optional[OracleDialect] = None
+
+
+def get_sql_dialect() -> OracleDialect:
+    """Dialecte SQL de la base configurée (DB_BACKEND)"""
+    global _dialect
+    if _dialect is None:
+        _dialect = get_dialect(get_database_config().backend)
+    return _dialect
+
+
+_session_pool: Optional[SessionPool] = None
+_session_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SessionPool:
+    global _session_pool
+    if _session_pool is None:
+        with _session_pool_lock:
+            if _session_pool is None:
+                config = get_database_config()
+                pool_class = SQLiteSessionPool if _is_sqlite(config) else SessionPool
+                _session_pool = pool_class(config)
+    return _session_pool
+
+
+def close_session_pool():
+    if _session_pool is not None:
+        _session_pool.close()
+
+
+_async_session_pool: Optional[AsyncSessionPool] = None
+
+
+def get_async_session_pool() -> AsyncSessionPool:
+    global _async_session_pool
+    if _async_session_pool is None:
+        with _session_pool_lock:
+            if _async_session_pool is None:
+                config = get_database_config()
+                pool_class = (
+                    AsyncSQLiteSessionPool if _is_sqlite(config) else AsyncSessionPool
+                )
+                _async_session_pool = pool_class(config)
+    return _async_session_pool
+
+
+async def close_async_session_pool():
+    if _async_session_pool is not None:
+        await _async_session_pool.close()
@@ -0,0 +1,179 @@
+import hashlib
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from core.config import get_app_config
+
+# Binds masqués dans le journal des requêtes lentes
+SENSITIVE_BINDS = ("password", "mot_de_passe", "email", "courriel", "token", "tel")
+MAX_BIND_LENGTH = 64
+FINGERPRINT_MEMO_SIZE = 4096
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w:.])\d+(?:\.\d+)?\b")
+_NUMBERED_BINDS = re.compile(r"(:[A-Za-z_]+?)_?\d+\b")
+_IN_LISTS = re.compile(r"\(\s*(?:\?|:\w+)(?:\s*,\s*(?:\?|:\w+))+\s*\)")
+_SPACES = re.compile(r"\s+")
+# Clause (NOT) EXISTS (...) répétée à l'identique (un critère par valeur)
+_REPEATED_EXISTS = re.compile(
+    r"((?:NOT )?EXISTS \((?:[^()]|\((?:[^()]|\([^()]*\))*\))*\))(?: AND \1)+", re.I
+)
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Forme normalisée d'une requête : littéraux remplacés par ?, binds
+    numérotés (:genre_inclus_0, :genre_inclus_1...) et listes IN réduits,
+    critères répétés fusionnés. Toutes les recherches de même forme
+    partagent ainsi une empreinte, quel que soit le nombre de valeurs.
+    """
+    text = _COMMENTS.sub(" ", statement)
+    text = _STRINGS.sub("?", text)
+    text = _NUMBERS.sub("?", text)
+    text = _NUMBERED_BINDS.sub(r"\1_N", text)
+    text = _SPACES.sub(" ", text).strip()
+    text = _IN_LISTS.sub("(...)", text)
+    text = _REPEATED_EXISTS.sub(r"\1 AND ...", text)
+    return text
+
+
+def sanitize_binds(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    sanitized = {}
+    for name, value in (params or {}).items():
+        if any(part in name.lower() for part in SENSITIVE_BINDS):
+            sanitized[name] = "***"
+        elif isinstance(value, str) and len(value) > MAX_BIND_LENGTH:
+            sanitized[name] = value[:MAX_BIND_LENGTH] + f"...({len(value)} chars)"
+        else:
+            sanitized[name] = value
+    return sanitized
+
+
+class _Aggregate:
+    __slots__ = ("fingerprint", "count", "errors", "total", "max", "rows", "slow", "last_seen")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.last_seen = 0.0
+
+    def as_dict(self, fingerprint_id: str) -> Dict:
+        return {
+            "id": fingerprint_id,
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "errors": self.errors,
+            "slow": self.slow,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+            "rows": self.rows,
+            "last_seen": self.last_seen,
+        }
+
+
+class QueryLog:
+    """
+    Agrégats de latence par empreinte de requête SQL et journal des
+    requêtes dépassant SLOW_QUERY_MS (binds nettoyés).
+    """
+
+    def __init__(self, slow_ms: float, max_fingerprints: int):
+        self.slow_threshold = slow_ms / 1000
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._aggregates: Dict[str, _Aggregate] = {}
+        # Texte de requête -> identifiant d'empreinte (normalisation mémorisée)
+        self._memo: Dict[str, str] = {}
+        self._dropped = 0
+
+    def _fingerprint_id(self, statement: str) -> str:
+        fingerprint_id = self._memo.get(statement)
+        if fingerprint_id is not None:
+            return fingerprint_id
+        normalized = fingerprint(statement)
+        fingerprint_id = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+        with self._lock:
+            if len(self._memo) >= FINGERPRINT_MEMO_SIZE:
+                self._memo.clear()
+            self._memo[statement] = fingerprint_id
+            if fingerprint_id not in self._aggregates:
+                if len(self._aggregates) >= self.max_fingerprints:
+                    self._dropped += 1
+                else:
+                    self._aggregates[fingerprint_id] = _Aggregate(normalized)
+        return fingerprint_id
+
+    def record(
+        self,
+        statement: str,
+        params: Optional[Dict[str, Any]],
+        elapsed: float,
+        rows: int = 0,
+        error: bool = False,
+    ):
+        fingerprint_id = self._fingerprint_id(statement)
+        slow = elapsed >= self.slow_threshold
+        with self._lock:
+            aggregate = self._aggregates.get(fingerprint_id)
+            if aggregate is not None:
+                aggregate.count += 1
+                aggregate.total += elapsed
+                aggregate.max = max(aggregate.max, elapsed)
+                aggregate.rows += rows
+                aggregate.last_seen = time.time()
+                if error:
+                    aggregate.errors += 1
+                if slow:
+                    aggregate.slow += 1
+        if slow:
+            print(
+                f"Slow query {elapsed * 1000:.1f} ms [{fingerprint_id}] "
+                f"rows={rows}{' error' if error else ''}: "
+                f"{_SPACES.sub(' ', statement).strip()} "
+                f"binds={sanitize_binds(params)}"
+            )
+
+    def top(self, limit: int = 20, order: str = "total") -> List[Dict]:
+        with self._lock:
+            rows = [agg.as_dict(fid) for fid, agg in self._aggregates.items()]
+        key = {"total": "total_ms", "mean": "mean_ms", "max": "max_ms", "count": "count"}
+        rows.sort(key=lambda row: row[key.get(order, "total_ms")], reverse=True)
+        return rows[:limit]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "fingerprints": len(self._aggregates),
+                "max_fingerprints": self.max_fingerprints,
+                "dropped": self._dropped,
+                "slow_query_ms": self.slow_threshold * 1000,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._aggregates.clear()
+            self._memo.clear()
+            self._dropped = 0
+
+
+_query_log: Optional[QueryLog] = None
+_query_log_lock = threading.Lock()
+
+
+def get_query_log() -> QueryLog:
+    global _query_log
+    if _query_log is None:
+        with _query_log_lock:
+            if _query_log is None:
+                config = get_app_config()
+                _query_log = QueryLog(config.SLOW_QUERY_MS, config.QUERY_LOG_MAX_FINGERPRINTS)
+    return _query_log
@@ -1,25 +1,23 @@
-from typing import Optional, List, Dict, Any
-import oracledb
-from core.config import get_database_config
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
+from core.metrics import record_statement
+from db.pool import get_async_session_pool, get_session_pool, get_sql_dialect
+from db.query_log import get_query_log
 
 
 class BaseRepository:
     def __init__(self):
-        self.config = get_database_config()
+        self.pool = get_session_pool()
+        self.dialect = get_sql_dialect()
+        self.query_log = get_query_log()
         self.conn = None
         self.cur = None
 
     def connect(self):
         try:
- 
-            dsn = f"{self.config.host}:{self.config.port}/{self.config.service_name}"
-
-            # Connect in Thin mode
-            self.conn = oracledb.connect(
-                user=self.config.user,
-                password=self.config.password,
-                dsn=dsn,
-            )
+            # Session empruntée au pool partagé du processus
+            self.conn = self.pool.acquire()
             self.cur = self.conn.cursor()
         except Exception as e:
             print(f"Error connecting to database: {e}")
@@ -28,26 +26,184 @@ class BaseRepository:
     def disconnect(self):
         if self.cur:
             self.cur.close()
+            self.cur = None
         if self.conn:
-            self.conn.close()
+            # Rend la session au pool au lieu de la fermer
+            self.pool.release(self.conn)
+            self.conn = None
+
+    def _execute(
+        self, statement: str, params: Dict[str, Any] = None, log: bool = True
+    ) -> float:
+        """Exécute et mesure ; log=False si l'appelant journalise après lecture"""
+        start = time.perf_counter()
+        try:
+            self.cur.execute(statement, params or {})
+        except Exception:
+            self.query_log.record(statement, params, time.perf_counter() - start, error=True)
+            raise
+        elapsed = time.perf_counter() - start
+        record_statement(type(self).__name__, "execute", elapsed)
+        if log:
+            self.query_log.record(statement, params, elapsed)
+        return elapsed
 
     def execute_query(self, query: str, params: Dict[str, Any] = None) -> List[Dict]:
         try:
             self.connect()
-            self.cur.execute(query, params or {})
+            elapsed = self._execute(query, params, log=False)
             columns = [col[0] for col in self.cur.description]
-            return [dict(zip(columns, row)) for row in self.cur.fetchall()]
+            start = time.perf_counter()
+            rows = self.cur.fetchall()
+            fetch = time.perf_counter() - start
+            record_statement(type(self).__name__, "fetch", fetch, len(rows))
+            self.query_log.record(query, params, elapsed + fetch, len(rows))
+            return [dict(zip(columns, row)) for row in rows]
         finally:
             self.disconnect()
 
     def execute_non_query(self, statement: str, params: Dict[str, Any] = None) -> None:
         """
-        For INSERT/UPDATE/DELETE statements. Opens/closes a connection each time.
+        For INSERT/UPDATE/DELETE statements. Borrows a pooled session each time.
         """
         try:
             self.connect()
-            self.cur.execute(statement, params or {})
+            self._execute(statement, params)
             self.conn.commit()
         finally:
             self.disconnect()
 
+
+
+class AsyncBaseRepository:
+    """
+    Version asyncio de BaseRepository.
+    Aucune session n'est gardée sur l'instance : les repositories sont
+    partagés entre toutes les requêtes concurrentes d'un worker.
+    """
+
+    def __init__(self):
+        self.pool = get_async_session_pool()
+        self.dialect = get_sql_dialect()
+        self.query_log = get_query_log()
+
+    @asynccontextmanager
+    async def connection(self):
+        conn = await self.pool.acquire()
+        try:
+            yield conn
+        finally:
+            await self.pool.release(conn)
+
+    @asynccontextmanager
+    async def cursor(self):
+        async with self.connection() as conn:
+            with conn.cursor() as cur:
+                yield cur
+
+    async def _execute(
+        self, cur, statement: str, params: Dict[str, Any] = None, log: bool = True
+    ) -> float:
+        """Exécute et mesure ; log=False si l'appelant journalise après lecture"""
+        start = time.perf_counter()
+        try:
+            await cur.execute(statement, params or {})
+        except Exception:
+            self.query_log.record(statement, params, time.perf_counter() - start, error=True)
+            raise
+        elapsed = time.perf_counter() - start
+        record_statement(type(self).__name__, "execute", elapsed)
+        if log:
+            self.query_log.record(statement, params, elapsed)
+        return elapsed
+
+    async def _execute_many(self, cur, statement: str, rows: List[Dict[str, Any]]) -> float:
+        """executemany : toutes les lignes en un seul aller-retour (array DML)"""
+        start = time.perf_counter()
+        try:
+            await cur.executemany(statement, rows)
+        except Exception:
+            self.query_log.record(
+                statement, {"rows": len(rows)}, time.perf_counter() - start, error=True
+            )
+            raise
+        elapsed = time.perf_counter() - start
+        record_statement(type(self).__name__, "execute", elapsed)
+        self.query_log.record(statement, {"rows": len(rows)}, elapsed, len(rows))
+        return elapsed
+
+    def _fetched(self, statement, params, elapsed: float, start: float, rows: int):
+        fetch = time.perf_counter() - start
+        record_statement(type(self).__name__, "fetch", fetch, rows)
+        self.query_log.record(statement, params, elapsed + fetch, rows)
+
+    async def query(self, cur, query: str, params: Dict[str, Any] = None) -> List[Tuple]:
+        elapsed = await self._execute(cur, query, params, log=False)
+        start = time.perf_counter()
+        rows = await cur.fetchall()
+        self._fetched(query, params, elapsed, start, len(rows))
+        return rows
+
+    async def query_one(self, cur, query: str, params: Dict[str, Any] = None) -> Optional[Tuple]:
+        elapsed = await self._execute(cur, query, params, log=False)
+        start = time.perf_counter()
+        row = await cur.fetchone()
+        self._fetched(query, params, elapsed, start, 1 if row else 0)
+        return row
+
+    async def stream(
+        self, cur, query: str, params: Dict[str, Any], batch_size: int
+    ) -> AsyncIterator[List[Tuple]]:
+        """
+        Lit le résultat par lots de batch_size (fetchmany) au lieu de fetchall.
+        arraysize/prefetchrows alignés sur le lot : un aller-retour par lot.
+        """
+        cur.arraysize = batch_size
+        cur.prefetchrows = batch_size
+        elapsed = await self._execute(cur, query, params, log=False)
+        total = 0
+        fetch = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                rows = await cur.fetchmany(batch_size)
+                fetch += time.perf_counter() - start
+                if not rows:
+                    break
+                total += len(rows)
+                yield rows
+        finally:
+            record_statement(type(self).__name__, "fetch", fetch, total)
+            self.query_log.record(query, params, elapsed + fetch, total)
+
+    async def execute_returning(
+        self, cur, statement: str, params: Dict[str, Any], columns: Dict[str, type]
+    ) -> Optional[Tuple]:
+        """
+        Exécute un DML terminé par dialect.returning(columns) sur le curseur
+        de l'appelant (sans commit). Retourne les valeurs de la première
+        ligne touchée, ou None si aucune ligne.
+        """
+        if not self.dialect.out_binds:
+            return await self.query_one(cur, statement, params)
+        out = {f"out_{name.lower()}": cur.var(kind) for name, kind in columns.items()}
+        await self._execute(cur, statement, {**params, **out})
+        values = [var.getvalue() for var in out.values()]
+        if not values or not values[0]:
+            return None
+        return tuple(value[0] for value in values)
+
+    async def execute_query(self, query: str, params: Dict[str, Any] = None) -> List[Dict]:
+        async with self.cursor() as cur:
+            rows = await self.query(cur, query, params)
+            columns = [col[0] for col in cur.description]
+            return [dict(zip(columns, row)) for row in rows]
+
+    async def execute_non_query(self, statement: str, params: Dict[str, Any] = None) -> None:
+        """
+        For INSERT/UPDATE/DELETE statements. Commits on the borrowed session.
+        """
+        async with self.connection() as conn:
+            with conn.cursor() as cur:
+                await self._execute(cur, statement, params)
+            await conn.commit()
@@ -1,179 +1,301 @@
-from typing import Dict, List, Optional
-
-from db.repositories.base import BaseRepository
-
+import base64
+import json
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from db.repositories.base import AsyncBaseRepository
+
+
+def encode_cursor(titre: str, film_id: int) -> str:
+    """Curseur opaque de pagination encodant la clé (TITRE, ID)"""
+    raw = json.dumps([titre, film_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Lève ValueError si le curseur n'a pas été produit par encode_cursor"""
+    try:
+        titre, film_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(titre), int(film_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _upper_list(values) -> List[str]:
+    """Valeurs distinctes en majuscules (comparaisons via UPPER)"""
+    if not values:
+        return []
+    if isinstance(values, str):
+        values = [values]
+    return sorted({value.strip().upper() for value in values if value and value.strip()})
+
+
+def _film_row(row: Tuple) -> Dict:
+    return {
+        "ID": row[0],
+        "TITRE": row[1],
+        "ANNEE": row[2],
+        "RESUME": str(row[3]) if row[3] else None,
+        "POSTER_URL": row[4],
+        "LANGUE": row[5],
+        "DUREE": row[6],
+    }
+
+
+class MoviesRepository(AsyncBaseRepository):
+
+    def _search_conditions(self, criteria: dict) -> Tuple[str, Dict]:
+        """Clause WHERE (alias F pour FILMS) et binds des critères de recherche"""
+        conditions = []
+        params = {}
+
+        # Recherche par titre
+        if criteria.get("TITRE"):
+            conditions.append("UPPER(F.TITRE) LIKE UPPER(:titre)")
+            params["titre"] = f"%{criteria['TITRE']}%"
+
+        # Recherche par année
+        if criteria.get("ANNEE_MIN"):
+            conditions.append("F.ANNEE >= :annee_min")
+            params["annee_min"] = criteria["ANNEE_MIN"]
+        if criteria.get("ANNEE_MAX"):
+            conditions.append("F.ANNEE <= :annee_max")
+            params["annee_max"] = criteria["ANNEE_MAX"]
+
+        # Recherche par langue
+        if criteria.get("LANGUE"):
+            conditions.append("UPPER(F.LANGUE) = UPPER(:langue)")
+            params["langue"] = criteria["LANGUE"]
+
+        # Recherche par durée
+        if criteria.get("DUREE_MIN"):
+            conditions.append("F.DUREE >= :duree_min")
+            params["duree_min"] = criteria["DUREE_MIN"]
+        if criteria.get("DUREE_MAX"):
+            conditions.append("F.DUREE <= :duree_max")
+            params["duree_max"] = criteria["DUREE_MAX"]
+
+        # Recherche dans le résumé
+        if criteria.get("RESUME"):
+            conditions.append("UPPER(F.RESUME) LIKE UPPER(:resume)")
+            params["resume"] = f"%{criteria['RESUME']}%"
+
+        # Critères de liste : une seule clause par critère, la liste
+        # étant liée en JSON. Le texte SQL ne dépend pas du nombre de
+        # valeurs (cache d'instructions du pilote, pas de hard parse).
+        json_strings = self.dialect.json_strings
+
+        # Genres résolus en ID par le service : un seul parcours de
+        # l'index FILM_GENRE (ID_GENRE, ID_FILM), sans jointure GENRES
+        json_ids = self.dialect.json_ids
+        if criteria.get("GENRE_IDS_INCLUS"):
+            conditions.append(
+                f"""
+                F.ID IN (
+                    SELECT FG.ID_FILM FROM FILM_GENRE FG
+                    WHERE FG.ID_GENRE IN ({json_ids("genre_ids_inclus")})
+                    GROUP BY FG.ID_FILM
+                    HAVING COUNT(DISTINCT FG.ID_GENRE) = :genre_ids_count
+                )
+            """
+            )
+            params["genre_ids_inclus"] = json.dumps(criteria["GENRE_IDS_INCLUS"])
+            params["genre_ids_count"] = len(criteria["GENRE_IDS_INCLUS"])
+
+        if criteria.get("GENRE_IDS_EXCLUS"):
+            conditions.append(
+                f"""
+                NOT EXISTS (
+                    SELECT 1 FROM FILM_GENRE FG
+                    WHERE FG.ID_FILM = F.ID
+                    AND FG.ID_GENRE IN ({json_ids("genre_ids_exclus")})
+                )
+            """
+            )
+            params["genre_ids_exclus"] = json.dumps(criteria["GENRE_IDS_EXCLUS"])
+
+        # Acteurs et scénaristes par ID : index (ID_ACTEUR, ID_FILM) et
+        # (ID_SCENARISTE, ID_FILM), le film doit les avoir tous
+        for key, table, column in (
+            ("ACTEUR_IDS", "ROLES", "ID_ACTEUR"),
+            ("SCENARISTE_IDS", "FILM_SCENARISTES", "ID_SCENARISTE"),
+        ):
+            ids = sorted({int(i) for i in criteria.get(key) or []})
+            if not ids:
+                continue
+            param = key.lower()
+            conditions.append(
+                f"""
+                F.ID IN (
+                    SELECT L.ID_FILM FROM {table} L
+                    WHERE L.{column} IN ({json_ids(param)})
+                    GROUP BY L.ID_FILM
+                    HAVING COUNT(DISTINCT L.{column}) = :{param}_count
+                )
+            """
+            )
+            params[param] = json.dumps(ids)
+            params[f"{param}_count"] = len(ids)
+
+        # Repli par nom (dictionnaire des genres pas encore chargé)
+        # Genres à inclure : le film doit les avoir tous
+        genres_inclus = _upper_list(criteria.get("GENRES_INCLUS"))
+        if genres_inclus:
+            conditions.append(
+                f"""
+                (
+                    SELECT COUNT(DISTINCT UPPER(G.NOM))
+                    FROM FILM_GENRE FG
+                    JOIN GENRES G ON FG.ID_GENRE = G.ID
+                    WHERE FG.ID_FILM = F.ID
+                    AND UPPER(G.NOM) IN ({json_strings("genres_inclus")})
+                ) = :genres_inclus_count
+            """
+            )
+            params["genres_inclus"] = json.dumps(genres_inclus)
+            params["genres_inclus_count"] = len(genres_inclus)
+
+        # Genres à exclure : aucun ne doit correspondre
+        genres_exclus = _upper_list(criteria.get("GENRES_EXCLUS"))
+        if genres_exclus:
+            conditions.append(
+                f"""
+                NOT EXISTS (
+                    SELECT 1 FROM FILM_GENRE FG
+                    JOIN GENRES G ON FG.ID_GENRE = G.ID
+                    WHERE FG.ID_FILM = F.ID
+                    AND UPPER(G.NOM) IN ({json_strings("genres_exclus")})
+                )
+            """
+            )
+            params["genres_exclus"] = json.dumps(genres_exclus)
+
+        # Scénaristes et acteurs par nom (repli sans ID) : chaque nom
+        # doit correspondre à une personne du film (division relationnelle)
+        scenaristes = _upper_list(criteria.get("SCENARISTES"))
+        if scenaristes:
+            conditions.append(
+                f"""
+                NOT EXISTS (
+                    SELECT 1 FROM ({json_strings("scenaristes")}) N
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM FILM_SCENARISTES FS
+                        JOIN SCENARISTES S ON FS.ID_SCENARISTE = S.ID
+                        WHERE FS.ID_FILM = F.ID
+                        AND UPPER(S.NOM) LIKE N.VAL
+                    )
+                )
+            """
+            )
+            params["scenaristes"] = json.dumps([f"%{nom}%" for nom in scenaristes])
+
+        acteurs = _upper_list(criteria.get("ACTEURS"))
+        if acteurs:
+            conditions.append(
+                f"""
+                NOT EXISTS (
+                    SELECT 1 FROM ({json_strings("acteurs")}) N
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM ROLES R
+                        JOIN PERSONNES P ON R.ID_ACTEUR = P.ID
+                        WHERE R.ID_FILM = F.ID
+                        AND UPPER(P.NOM) LIKE N.VAL
+                    )
+                )
+            """
+            )
+            params["acteurs"] = json.dumps([f"%{nom}%" for nom in acteurs])
 
-class MoviesRepository(BaseRepository):
+        # Combine all conditions
+        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        return where_clause, params
 
-    def search_films(self, criteria: dict) -> Dict:
+    async def search_films(self, criteria: dict) -> Dict:
         """
         Recherche des films selon plusieurs critères
         Retourne un format compatible avec MoviesPaginatedResponse
         """
+        where_clause, params = self._search_conditions(criteria)
         try:
-            self.connect()
-
-            conditions = []
-            params = {}
-
-            # Recherche par titre
-            if criteria.get("TITRE"):
-                conditions.append("UPPER(F.TITRE) LIKE UPPER(:titre)")
-                params["titre"] = f"%{criteria['TITRE']}%"
-
-            # Recherche par année
-            if criteria.get("ANNEE_MIN"):
-                conditions.append("F.ANNEE >= :annee_min")
-                params["annee_min"] = criteria["ANNEE_MIN"]
-            if criteria.get("ANNEE_MAX"):
-                conditions.append("F.ANNEE <= :annee_max")
-                params["annee_max"] = criteria["ANNEE_MAX"]
-
-            # Recherche par langue
-            if criteria.get("LANGUE"):
-                conditions.append("UPPER(F.LANGUE) = UPPER(:langue)")
-                params["langue"] = criteria["LANGUE"]
-
-            # Recherche par durée
-            if criteria.get("DUREE_MIN"):
-                conditions.append("F.DUREE >= :duree_min")
-                params["duree_min"] = criteria["DUREE_MIN"]
-            if criteria.get("DUREE_MAX"):
-                conditions.append("F.DUREE <= :duree_max")
-                params["duree_max"] = criteria["DUREE_MAX"]
-
-            # Recherche dans le résumé
-            if criteria.get("RESUME"):
-                conditions.append("UPPER(F.RESUME) LIKE UPPER(:resume)")
-                params["resume"] = f"%{criteria['RESUME']}%"
-
-            # Genres à inclure
-            if criteria.get("GENRES_INCLUS"):
-                genres_inclus = criteria["GENRES_INCLUS"]
-                if isinstance(genres_inclus, str):
-                    genres_inclus = [genres_inclus]
-                for i, genre in enumerate(genres_inclus):
-                    param_name = f"genre_inclus_{i}"
-                    conditions.append(
-                        f"""
-                        EXISTS (
-                            SELECT 1 FROM FILM_GENRE FG
-                            JOIN GENRES G ON FG.ID_GENRE = G.ID
-                            WHERE FG.ID_FILM = F.ID 
-                            AND UPPER(G.NOM) = UPPER(:{param_name})
-                        )
-                    """
-                    )
-                    params[param_name] = genre
-
-            # Genres à exclure
-            if criteria.get("GENRES_EXCLUS"):
-                genres_exclus = criteria["GENRES_EXCLUS"]
-                if isinstance(genres_exclus, str):
-                    genres_exclus = [genres_exclus]
-                for i, genre in enumerate(genres_exclus):
-                    param_name = f"genre_exclus_{i}"
-                    conditions.append(
-                        f"""
-                        NOT EXISTS (
-                            SELECT 1 FROM FILM_GENRE FG
-                            JOIN GENRES G ON FG.ID_GENRE = G.ID
-                            WHERE FG.ID_FILM = F.ID 
-                            AND UPPER(G.NOM) = UPPER(:{param_name})
-                        )
-                    """
-                    )
-                    params[param_name] = genre
-
-            if criteria.get("SCENARISTES") and len(criteria["SCENARISTES"]) > 0:
-                for i, scenariste in enumerate(criteria["SCENARISTES"]):
-                    param_name = f"scenariste_{i}"
-                    conditions.append(
-                        f"""
-                        EXISTS (
-                            SELECT 1 FROM FILM_SCENARISTES FS
-                            JOIN SCENARISTES S ON FS.ID_SCENARISTE = S.ID
-                            WHERE FS.ID_FILM = F.ID 
-                            AND UPPER(S.NOM) LIKE UPPER(:{param_name})
-                        )
-                    """
-                    )
-                    params[param_name] = f"%{scenariste}%"
-
-            if criteria.get("ACTEURS") and len(criteria["ACTEURS"]) > 0:
-                for i, acteur in enumerate(criteria["ACTEURS"]):
-                    param_name = f"acteur_{i}"
-                    conditions.append(
-                        f"""
-                        EXISTS (
-                            SELECT 1 FROM ROLES R
-                            JOIN PERSONNES P ON R.ID_ACTEUR = P.ID
-                            WHERE R.ID_FILM = F.ID 
-                            AND UPPER(P.NOM) LIKE UPPER(:{param_name})
+            async with self.cursor() as cur:
+                # Pagination parameters
+                page = criteria.get("page", 1)
+                per_page = criteria.get("limit", 10)
+                cursor = criteria.get("cursor")
+
+                select_clause = """
+                    SELECT
+                        F.ID,
+                        F.TITRE,
+                        F.ANNEE,
+                        F.RESUME,
+                        F.POSTER_URL,
+                        F.LANGUE,
+                        F.DUREE
+                    FROM FILMS F
+                """
+
+                if cursor:
+                    # Mode curseur : recherche par clé (TITRE, ID) sur l'index,
+                    # sans compter ni trier les lignes des pages précédentes
+                    cursor_titre, cursor_id = decode_cursor(cursor)
+                    main_query = f"""
+                        {select_clause}
+                        WHERE {where_clause}
+                        AND (
+                            F.TITRE > :cursor_titre
+                            OR (F.TITRE = :cursor_titre AND F.ID > :cursor_id)
                         )
+                        ORDER BY F.TITRE, F.ID
+                        {self.dialect.limit()}
                     """
+                    rows = await self.query(
+                        cur,
+                        main_query,
+                        {
+                            **params,
+                            "cursor_titre": cursor_titre,
+                            "cursor_id": cursor_id,
+                            "limit": per_page,
+                        },
                     )
-                    params[param_name] = f"%{acteur}%"
-
-            # Combine all conditions
-            where_clause = " AND ".join(conditions) if conditions else "1=1"
-
-            # Count total records
-            count_query = f"""
-                SELECT COUNT(DISTINCT F.ID) 
-                FROM FILMS F 
-                WHERE {where_clause}
-            """
-
-            self.cur.execute(count_query, params)
-            total_count = self.cur.fetchone()[0]
-
-            # Pagination parameters
-            page = criteria.get("page", 1)
-            per_page = criteria.get("limit", 10)
-            offset = (page - 1) * per_page
-
-            # Main query with pagination
-            main_query = f"""
-                SELECT * FROM (
-                    SELECT a.*, ROWNUM rnum FROM (
-                        SELECT DISTINCT 
-                            F.ID,
-                            F.TITRE,
-                            F.ANNEE,
-                            F.RESUME,
-                            F.POSTER_URL,
-                            F.LANGUE,
-                            F.DUREE
+                    total_count = None
+                else:
+                    # Count total records
+                    count_query = f"""
+                        SELECT COUNT(*)
                         FROM FILMS F
                         WHERE {where_clause}
-                        ORDER BY F.TITRE
-                    ) a WHERE ROWNUM <= :upper_limit
-                ) WHERE rnum > :lower_limit
-            """
+                    """
+                    total_count = (await self.query_one(cur, count_query, params))[0]
 
-            params["upper_limit"] = offset + per_page
-            params["lower_limit"] = offset
+                    offset = (page - 1) * per_page
 
-            # Execute main query
-            self.cur.execute(main_query, params)
+                    # Main query with pagination
+                    main_query = f"""
+                        {select_clause}
+                        WHERE {where_clause}
+                        ORDER BY F.TITRE, F.ID
+                        {self.dialect.offset_limit()}
+                    """
+                    rows = await self.query(
+                        cur,
+                        main_query,
+                        {**params, "offset": offset, "limit": per_page},
+                    )
 
             # Process results
-            results = []
-            for row in self.cur.fetchall():
-                movie = {
-                    "ID": row[0],
-                    "TITRE": row[1],
-                    "ANNEE": row[2],
-                    "RESUME": str(row[3]) if row[3] else None,
-                    "POSTER_URL": row[4],
-                    "LANGUE": row[5],
-                    "DUREE": row[6],
-                }
-                results.append(movie)
+            results = [_film_row(row) for row in rows]
+
+            # Une page pleine peut avoir une suite : curseur vers le dernier film
+            next_cursor = None
+            if len(results) == per_page:
+                last = results[-1]
+                next_cursor = encode_cursor(last["TITRE"], last["ID"])
 
             # Calculate total pages
-            total_pages = (total_count + per_page - 1) // per_page
+            total_pages = None
+            if total_count is not None:
+                total_pages = (total_count + per_page - 1) // per_page
 
             return {
                 "items": results,
@@ -181,292 +303,351 @@ class MoviesRepository(BaseRepository):
                 "page": page,
                 "per_page": per_page,
                 "total_pages": total_pages,
+                "next_cursor": next_cursor,
             }
 
         except Exception as e:
             print(f"Error searching films: {e}")
             raise
-        finally:
-            self.disconnect()
 
-    def get_film_by_id(self, film_id: int) -> Optional[Dict]:
+    async def stream_films(self, criteria: dict, batch_size: int) -> AsyncIterator[List[Dict]]:
         """
-        Récupère les détails d'un film par son ID
+        Tous les films correspondant aux critères (sans pagination), par lots
+        de batch_size lus au fil de l'eau sur un même curseur : la mémoire
+        ne dépend pas du nombre de résultats. Le lot suivant n'est lu que
+        lorsque l'appelant a consommé le précédent.
+        """
+        where_clause, params = self._search_conditions(criteria)
+        query = f"""
+            SELECT F.ID, F.TITRE, F.ANNEE, F.RESUME, F.POSTER_URL, F.LANGUE, F.DUREE
+            FROM FILMS F
+            WHERE {where_clause}
+            ORDER BY F.TITRE, F.ID
         """
         try:
-            self.connect()
-            # Requête principale pour les informations de base du film
-            query = """
-                SELECT 
-                    F.ID,
-                    F.TITRE,
-                    F.ANNEE,
-                    F.LANGUE,
-                    F.DUREE,
-                    F.RESUME,
-                    F.POSTER_URL,
-                    F.ID_REALISATEUR
-                FROM FILMS F
-                WHERE F.ID = :film_id
-            """
-
-            self.cur.execute(query, {"film_id": film_id})
-            result = self.cur.fetchone()
-
-            if not result:
-                return None
-
-            # Création du dictionnaire de base
-            film_dict = {
-                "ID": result[0],
-                "TITRE": result[1],
-                "ANNEE": result[2],
-                "LANGUE": result[3],
-                "DUREE": result[4],
-                "RESUME": str(result[5]),
-                "POSTER_URL": result[6],
-                "ID_REALISATEUR": result[7],
-            }
-
-            # Requête séparée pour les genres
-            genres_query = """
-                SELECT G.NOM
-                FROM FILM_GENRE FG
-                JOIN GENRES G ON FG.ID_GENRE = G.ID
-                WHERE FG.ID_FILM = :film_id
-            """
-            self.cur.execute(genres_query, {"film_id": film_id})
-            film_dict["GENRES"] = [row[0] for row in self.cur.fetchall()]
-
-            # Requête séparée pour les pays
-            pays_query = """
-                SELECT P.NOM
-                FROM FILM_PAYS FP
-                JOIN PAYS P ON FP.ID_PAYS = P.ID
-                WHERE FP.ID_FILM = :film_id
-            """
-            self.cur.execute(pays_query, {"film_id": film_id})
-            film_dict["PAYS"] = [row[0] for row in self.cur.fetchall()]
-
-            # Requête séparée pour les scénaristes
-            scenaristes_query = """
-                SELECT S.NOM
-                FROM FILM_SCENARISTES FS
-                JOIN SCENARISTES S ON FS.ID_SCENARISTE = S.ID
-                WHERE FS.ID_FILM = :film_id
-            """
-            self.cur.execute(scenaristes_query, {"film_id": film_id})
-            film_dict["SCENARISTES"] = [row[0] for row in self.cur.fetchall()]
-
-            # Requête séparée pour les acteurs et leurs rôles
-            actors_query = """
-                SELECT 
-                    P.ID,
-                    P.NOM,
-                    R.PERSONNAGE
-                FROM ROLES R
-                JOIN PERSONNES P ON R.ID_ACTEUR = P.ID
-                WHERE R.ID_FILM = :film_id
-            """
+            async with self.cursor() as cur:
+                batches = self.stream(cur, query, params, batch_size)
+                try:
+                    async for rows in batches:
+                        yield [_film_row(row) for row in rows]
+                finally:
+                    await batches.aclose()
+        except Exception as e:
+            print(f"Error streaming films: {e}")
+            raise
 
-            self.cur.execute(actors_query, {"film_id": film_id})
-            film_dict["ACTEURS"] = [
-                {"id": row[0], "nom": row[1], "role": row[2]}
-                for row in self.cur.fetchall()
-            ]
-
-            # Requête pour récupérer les bandes annonces
-            trailers_query = """
-                SELECT URL
-                FROM ANNONCES
-                WHERE ID_FILM = :film_id
-                ORDER BY ID
-            """
-            self.cur.execute(trailers_query, {"film_id": film_id})
-            film_dict["ANNONCES"] = [row[0] for row in self.cur.fetchall()]
+    async def get_film_by_id(self, film_id: int) -> Optional[Dict]:
+        """
+        Récupère les détails d'un film par son ID
+        """
+        films = await self.get_films_by_ids([film_id])
+        return films[0] if films else None
 
-            return film_dict
+    async def get_films_by_ids(self, film_ids: List[int]) -> List[Dict]:
+        """
+        Récupère les détails complets de plusieurs films en un seul aller-retour.
+        Les relations (genres, pays, scénaristes, acteurs, annonces) sont
+        agrégées en JSON par la base ; l'ordre de film_ids est conservé.
+        """
+        if not film_ids:
+            return []
+        try:
+            async with self.cursor() as cur:
+                dialect = self.dialect
+                genres = dialect.json_array(
+                    "G.NOM",
+                    """
+                    FROM FILM_GENRE FG
+                    JOIN GENRES G ON FG.ID_GENRE = G.ID
+                    WHERE FG.ID_FILM = F.ID
+                    """,
+                )
+                pays = dialect.json_array(
+                    "P.NOM",
+                    """
+                    FROM FILM_PAYS FP
+                    JOIN PAYS P ON FP.ID_PAYS = P.ID
+                    WHERE FP.ID_FILM = F.ID
+                    """,
+                )
+                scenaristes = dialect.json_array(
+                    "S.NOM",
+                    """
+                    FROM FILM_SCENARISTES FS
+                    JOIN SCENARISTES S ON FS.ID_SCENARISTE = S.ID
+                    WHERE FS.ID_FILM = F.ID
+                    """,
+                )
+                acteurs = dialect.json_array(
+                    dialect.json_object(
+                        [("id", "P.ID"), ("nom", "P.NOM"), ("role", "R.PERSONNAGE")]
+                    ),
+                    """
+                    FROM ROLES R
+                    JOIN PERSONNES P ON R.ID_ACTEUR = P.ID
+                    WHERE R.ID_FILM = F.ID
+                    """,
+                )
+                annonces = dialect.json_array(
+                    "A.URL",
+                    "FROM ANNONCES A WHERE A.ID_FILM = F.ID",
+                    order_by="A.ID",
+                )
+                query = f"""
+                    SELECT
+                        F.ID,
+                        F.TITRE,
+                        F.ANNEE,
+                        F.LANGUE,
+                        F.DUREE,
+                        F.RESUME,
+                        F.POSTER_URL,
+                        F.ID_REALISATEUR,
+                        {genres} AS GENRES,
+                        {pays} AS PAYS,
+                        {scenaristes} AS SCENARISTES,
+                        {acteurs} AS ACTEURS,
+                        {annonces} AS ANNONCES
+                    FROM FILMS F
+                    WHERE F.ID IN ({dialect.json_ids("film_ids")})
+                """
+                rows = await self.query(cur, query, {"film_ids": json.dumps(film_ids)})
+
+            films = {}
+            for row in rows:
+                films[row[0]] = {
+                    "ID": row[0],
+                    "TITRE": row[1],
+                    "ANNEE": row[2],
+                    "LANGUE": row[3],
+                    "DUREE": row[4],
+                    "RESUME": str(row[5]) if row[5] else None,
+                    "POSTER_URL": row[6],
+                    "ID_REALISATEUR": row[7],
+                    "GENRES": json.loads(row[8]) if row[8] else [],
+                    "PAYS": json.loads(row[9]) if row[9] else [],
+                    "SCENARISTES": json.loads(row[10]) if row[10] else [],
+                    "ACTEURS": json.loads(row[11]) if row[11] else [],
+                    "ANNONCES": json.loads(row[12]) if row[12] else [],
+                }
+            return [films[film_id] for film_id in film_ids if film_id in films]
 
         except Exception as e:
-            print(f"Error getting film by id: {e}")
+            print(f"Error getting films by ids: {e}")
             raise
-        finally:
-            self.disconnect()
 
-    def get_trailer_by_id(self, film_id: int) -> Optional[str]:
+    async def get_trailer_by_id(self, film_id: int) -> Optional[str]:
         """
         Récupère l'URL de la bande annonce d'un film par son ID
         """
         try:
-            self.connect()
-            query = """
-                SELECT * FROM ANNONCES a 
-                JOIN FILMS f ON a.ID_FILM = f.ID
-                WHERE f.ID = :film_id
-            """
-            self.cur.execute(query, {"film_id": film_id})
-            result = self.cur.fetchone()
-            print(result)
-            return result[0] if result else None
+            async with self.cursor() as cur:
+                query = f"""
+                    SELECT A.URL FROM ANNONCES A
+                    WHERE A.ID_FILM = :film_id
+                    ORDER BY A.ID
+                    {self.dialect.limit()}
+                """
+                result = await self.query_one(
+                    cur, query, {"film_id": film_id, "limit": 1}
+                )
+                print(result)
+                return result[0] if result else None
         except Exception as e:
             print(f"Error getting trailer by id: {e}")
             raise
-        finally:
-            self.disconnect()
 
-    def get_suggestion(self, search_term, limit: int = 5):
+    async def get_suggestion(self, search_term, limit: int = 5):
         """
         Get movie suggestions using Oracle's built-in string functions
         """
         try:
-            self.connect()  # Always start with a connection
-
-            query = """
-                SELECT DISTINCT F.ID, F.TITRE
-                FROM FILMS F
-                WHERE 
-                    UPPER(F.TITRE) LIKE UPPER(:search_term || '%')
-                    OR UPPER(F.TITRE) LIKE UPPER('% ' || :search_term || '%')
-                    OR UPPER(F.TITRE) LIKE UPPER('%' || :search_term || '%')
-                ORDER BY 
-                    CASE 
-                        WHEN UPPER(F.TITRE) LIKE UPPER(:search_term || '%') THEN 1
-                        WHEN UPPER(F.TITRE) LIKE UPPER('%' || :search_term || '%') THEN 2
-                        ELSE 3
-                    END,
-                    LENGTH(F.TITRE), 
-                    F.TITRE        
-                FETCH FIRST :limit ROWS ONLY
-            """
-
-            # Execute query with both parameters properly bound
-            self.cur.execute(
-                query, {"search_term": search_term.upper(), "limit": limit}
-            )
-
-            # Fetch results before disconnecting
-            results = [{"ID": row[0], "TITRE": row[1]} for row in self.cur.fetchall()]
-            print(results)
-            return results
+            async with self.cursor() as cur:
+
+                query = f"""
+                    SELECT DISTINCT F.ID, F.TITRE
+                    FROM FILMS F
+                    WHERE 
+                        UPPER(F.TITRE) LIKE UPPER(:search_term || '%')
+                        OR UPPER(F.TITRE) LIKE UPPER('% ' || :search_term || '%')
+                        OR UPPER(F.TITRE) LIKE UPPER('%' || :search_term || '%')
+                    ORDER BY 
+                        CASE 
+                            WHEN UPPER(F.TITRE) LIKE UPPER(:search_term || '%') THEN 1
+                            WHEN UPPER(F.TITRE) LIKE UPPER('%' || :search_term || '%') THEN 2
+                            ELSE 3
+                        END,
+                        LENGTH(F.TITRE), 
+                        F.TITRE        
+                    {self.dialect.limit()}
+                """
+
+                # Execute query with both parameters properly bound
+                rows = await self.query(
+                    cur, query, {"search_term": search_term.upper(), "limit": limit}
+                )
+
+                results = [{"ID": row[0], "TITRE": row[1]} for row in rows]
+                print(results)
+                return results
 
         except Exception as e:
             print(f"Error getting suggestions: {e}")
             raise
-        finally:
-            self.disconnect()  # Always disconnect in finally block
 
-    def get_genres(self):
+    async def list_genres(self) -> List[Tuple[int, str]]:
+        """
+        (ID, NOM) de tous les genres, pour le dictionnaire en mémoire
+        """
+        try:
+            async with self.cursor() as cur:
+                return await self.query(cur, "SELECT G.ID, G.NOM FROM GENRES G ORDER BY G.NOM")
+        except Exception as e:
+            print(f"Error listing genres: {e}")
+            raise
+
+    async def get_genres(self):
         """
         Récupère la liste de tous les genres
         """
         try:
-            self.connect()
-            query = "SELECT NOM FROM GENRES"
-            self.cur.execute(query)
-            return [row[0] for row in self.cur.fetchall()]
+            async with self.cursor() as cur:
+                query = "SELECT NOM FROM GENRES"
+                rows = await self.query(cur, query)
+                return [row[0] for row in rows]
         except Exception as e:
             print(f"Error getting genres: {e}")
             raise
-        finally:
-            self.disconnect()
 
-    def get_films_by_scenariste(self, nom_scenariste: str) -> List[Dict]:
+    async def get_films_by_scenariste(self, nom_scenariste: str) -> List[Dict]:
         """
         Récupère les films par le nom du scénariste
         """
         try:
-            self.connect()
-            query = """
-                SELECT f.id, f.titre, f.annee, f.duree, f.poster_url
-                FROM FILMS f
-                JOIN FILM_SCENARISTES fs ON f.id = fs.id_film
-                JOIN SCENARISTES s ON fs.id_scenariste = s.id
-                WHERE s.nom = :nom_scenariste
-            """
-            self.cur.execute(query, {"nom_scenariste": nom_scenariste})
-            result = self.cur.fetchall()
-            films = [
-                {
-                    "ID": row[0],
-                    "TITRE": row[1],
-                    "ANNEE": row[2],
-                    "DUREE": row[3],
-                    "POSTER_URL": row[4],
-                }
-                for row in result
-            ]
-            return films
+            async with self.cursor() as cur:
+                query = """
+                    SELECT f.id, f.titre, f.annee, f.duree, f.poster_url
+                    FROM FILMS f
+                    JOIN FILM_SCENARISTES fs ON f.id = fs.id_film
+                    JOIN SCENARISTES s ON fs.id_scenariste = s.id
+                    WHERE s.nom = :nom_scenariste
+                """
+                result = await self.query(cur, query, {"nom_scenariste": nom_scenariste})
+                films = [
+                    {
+                        "ID": row[0],
+                        "TITRE": row[1],
+                        "ANNEE": row[2],
+                        "DUREE": row[3],
+                        "POSTER_URL": row[4],
+                    }
+                    for row in result
+                ]
+                return films
         except Exception as e:
             print(f"Error getting films by scenariste: {e}")
             raise
-        finally:
-            self.disconnect()
 
-    def get_actor_suggestions(self, term: str, limit: int = 5):
+    async def get_actor_suggestions(self, term: str, limit: int = 5):
         """
         Get actor name suggestions
         """
         try:
-            self.connect()  # Establish the connection first
-
-            query = """
-                SELECT DISTINCT P.ID, P.NOM
-                FROM PERSONNES P
-                JOIN ROLES R ON P.ID = R.ID_ACTEUR
-                WHERE 
-                    UPPER(P.NOM) LIKE UPPER(:search_term || '%')
-                    OR UPPER(P.NOM) LIKE UPPER('% ' || :search_term || '%')
-                    OR UPPER(P.NOM) LIKE UPPER('%' || :search_term || '%')
-                ORDER BY 
-                    CASE 
-                        WHEN UPPER(P.NOM) LIKE UPPER(:search_term || '%') THEN 1
-                        WHEN UPPER(P.NOM) LIKE UPPER('%' || :search_term || '%') THEN 2
-                        ELSE 3
-                    END,
-                    LENGTH(P.NOM), 
-                    P.NOM        
-                FETCH FIRST :limit ROWS ONLY
-            """
-
-            self.cur.execute(query, {"search_term": term.upper(), "limit": limit})
-            result = self.cur.fetchall()
-            return [{"ID": row[0], "NOM": row[1]} for row in result]
+            async with self.cursor() as cur:
+
+                query = f"""
+                    SELECT DISTINCT P.ID, P.NOM
+                    FROM PERSONNES P
+                    JOIN ROLES R ON P.ID = R.ID_ACTEUR
+                    WHERE 
+                        UPPER(P.NOM) LIKE UPPER(:search_term || '%')
+                        OR UPPER(P.NOM) LIKE UPPER('% ' || :search_term || '%')
+                        OR UPPER(P.NOM) LIKE UPPER('%' || :search_term || '%')
+                    ORDER BY 
+                        CASE 
+                            WHEN UPPER(P.NOM) LIKE UPPER(:search_term || '%') THEN 1
+                            WHEN UPPER(P.NOM) LIKE UPPER('%' || :search_term || '%') THEN 2
+                            ELSE 3
+                        END,
+                        LENGTH(P.NOM), 
+                        P.NOM        
+                    {self.dialect.limit()}
+                """
+
+                result = await self.query(
+                    cur, query, {"search_term": term.upper(), "limit": limit}
+                )
+                return [{"ID": row[0], "NOM": row[1]} for row in result]
         except Exception as e:
             print(f"Error getting actor suggestions: {e}")
             raise
-        finally:
-            self.disconnect()  # Always disconnect in finally block
 
-    def get_scenariste_suggestions(self, term: str, limit: int = 5):
+    async def get_scenariste_suggestions(self, term: str, limit: int = 5):
         """
         Get screenwriter (scenariste) name suggestions
         """
         try:
-            self.connect()  # Establish the connection first
-
-            query = """
-                SELECT DISTINCT S.ID, S.NOM
-                FROM SCENARISTES S
-                WHERE 
-                    UPPER(S.NOM) LIKE UPPER(:search_term || '%')
-                    OR UPPER(S.NOM) LIKE UPPER('% ' || :search_term || '%')
-                    OR UPPER(S.NOM) LIKE UPPER('%' || :search_term || '%')
-                ORDER BY 
-                    CASE 
-                        WHEN UPPER(S.NOM) LIKE UPPER(:search_term || '%') THEN 1
-                        WHEN UPPER(S.NOM) LIKE UPPER('%' || :search_term || '%') THEN 2
-                        ELSE 3
-                    END,
-                    LENGTH(S.NOM), 
-                    S.NOM        
-                FETCH FIRST :limit ROWS ONLY
-            """
-
-            self.cur.execute(query, {"search_term": term.upper(), "limit": limit})
-            result = self.cur.fetchall()
-            return [{"ID": row[0], "NOM": row[1]} for row in result]
+            async with self.cursor() as cur:
+
+                query = f"""
+                    SELECT DISTINCT S.ID, S.NOM
+                    FROM SCENARISTES S
+                    WHERE 
+                        UPPER(S.NOM) LIKE UPPER(:search_term || '%')
+                        OR UPPER(S.NOM) LIKE UPPER('% ' || :search_term || '%')
+                        OR UPPER(S.NOM) LIKE UPPER('%' || :search_term || '%')
+                    ORDER BY 
+                        CASE 
+                            WHEN UPPER(S.NOM) LIKE UPPER(:search_term || '%') THEN 1
+                            WHEN UPPER(S.NOM) LIKE UPPER('%' || :search_term || '%') THEN 2
+                            ELSE 3
+                        END,
+                        LENGTH(S.NOM), 
+                        S.NOM        
+                    {self.dialect.limit()}
+                """
+
+                result = await self.query(
+                    cur, query, {"search_term": term.upper(), "limit": limit}
+                )
+                return [{"ID": row[0], "NOM": row[1]} for row in result]
         except Exception as e:
             print(f"Error getting screenwriter suggestions: {e}")
             raise
-        finally:
-            self.disconnect()  # Always disconnect in finally block
+
+    async def _list_names(self, query: str, after_id: int) -> List[Tuple[int, str]]:
+        try:
+            async with self.cursor() as cur:
+                # Gros volumes : moins d'allers-retours par lot de lignes
+                cur.arraysize = 5000
+                cur.prefetchrows = 5000
+                return await self.query(cur, query, {"after_id": after_id})
+        except Exception as e:
+            print(f"Error listing names: {e}")
+            raise
+
+    async def list_film_titles(self, after_id: int = 0) -> List[Tuple[int, str]]:
+        """
+        (ID, TITRE) des films d'ID supérieur à after_id, pour l'autocomplétion
+        """
+        query = "SELECT F.ID, F.TITRE FROM FILMS F WHERE F.ID > :after_id"
+        return await self._list_names(query, after_id)
+
+    async def list_actor_names(self, after_id: int = 0) -> List[Tuple[int, str]]:
+        """
+        (ID, NOM) des personnes ayant au moins un rôle
+        """
+        query = """
+            SELECT P.ID, P.NOM
+            FROM PERSONNES P
+            WHERE P.ID > :after_id
+            AND EXISTS (SELECT 1 FROM ROLES R WHERE R.ID_ACTEUR = P.ID)
+        """
+        return await self._list_names(query, after_id)
+
+    async def list_scenariste_names(self, after_id: int = 0) -> List[Tuple[int, str]]:
+        """
+        (ID, NOM) des scénaristes
+        """
+        query = "SELECT S.ID, S.NOM FROM SCENARISTES S WHERE S.ID > :after_id"
+        return await self._list_names(query, after_id)
@@ -1,11 +1,12 @@
 
+import json
 from typing import List, Optional, Dict
-from db.repositories.base import BaseRepository
+from db.repositories.base import AsyncBaseRepository
 from models.domain.user import User
 
 
-class UserRepository(BaseRepository):
-    def get_by_email(self, email: str) -> Optional[Dict]:
+class UserRepository(AsyncBaseRepository):
+    async def get_by_email(self, email: str) -> Optional[Dict]:
         query = """
             SELECT ID, NOM_FAMILLE, PRENOM, COURRIEL, TEL,
                 DATE_ANNIVERSAIRE, ADRESSE, VILLE,
@@ -13,38 +14,50 @@ class UserRepository(BaseRepository):
             FROM CLIENTS
             WHERE COURRIEL = :email
         """
-        rows = self.execute_query(query, {"email": email})
+        rows = await self.execute_query(query, {"email": email})
         return rows[0] if rows else None
 
-    def get_by_email_password(self, email: str) -> Optional[Dict]:
+    async def get_by_email_password(self, email: str) -> Optional[Dict]:
         query = """
             SELECT NOM_FAMILLE, PRENOM, MOT_DE_PASSE
             FROM CLIENTS
             WHERE COURRIEL = :email
         """
-        rows = self.execute_query(query, {"email": email})
+        rows = await self.execute_query(query, {"email": email})
         return rows[0] if rows else None
 
-    def create(self, user: User) -> bool:
+    async def update_password_hash(self, email: str, password_hash: str) -> bool:
+        try:
+            await self.execute_non_query(
+                "UPDATE CLIENTS SET MOT_DE_PASSE = :password_hash WHERE COURRIEL = :email",
+                {"password_hash": password_hash, "email": email},
+            )
+            return True
+        except Exception as e:
+            print(f"Error updating password hash: {e}")
+            return False
+
+    async def create(self, user: User) -> Optional[int]:
+        """
+        INSERT sans ID : la base l'attribue (séquence CLIENTS_SEQ en valeur
+        par défaut sur Oracle, rowid sur SQLite) et le renvoie par RETURNING.
+        Pas de SELECT MAX(ID) préalable ni de collision entre inscriptions
+        simultanées. Retourne l'ID du nouveau client, ou None en cas d'échec.
         """
-        Uses execute_non_query() for the INSERT
+        insert_stmt = f"""
+            INSERT INTO CLIENTS (
+                COURRIEL, MOT_DE_PASSE, NOM_FAMILLE,
+                PRENOM, TEL, DATE_ANNIVERSAIRE, ADRESSE,
+                VILLE, PROVINCE, CODE_POSTAL, FORFAIT
+            ) VALUES (
+                :email, :password, :lastname,
+                :firstname, :tel, :birthdate, :address,
+                :city, :province, :postal_code, :plan
+            )
+            {self.dialect.returning(["ID"])}
         """
         try:
-            new_id = self.generate_id()
-
-            insert_stmt = """
-                INSERT INTO CLIENTS (
-                    ID, COURRIEL, MOT_DE_PASSE, NOM_FAMILLE,
-                    PRENOM, TEL, DATE_ANNIVERSAIRE, ADRESSE,
-                    VILLE, PROVINCE, CODE_POSTAL, FORFAIT
-                ) VALUES (
-                    :id, :email, :password, :lastname,
-                    :firstname, :tel, :birthdate, :address,
-                    :city, :province, :postal_code, :plan
-                )
-            """
             params = {
-                "id": new_id,
                 "email": user.courriel,
                 "password": user.mot_de_passe,
                 "lastname": user.nom_famille,
@@ -57,23 +70,17 @@ class UserRepository(BaseRepository):
                 "postal_code": user.code_postal,
                 "plan": user.forfait,
             }
-            self.execute_non_query(insert_stmt, params)
-            return True
+            async with self.connection() as conn:
+                with conn.cursor() as cur:
+                    row = await self.execute_returning(cur, insert_stmt, params, {"ID": int})
+                await conn.commit()
+            return int(row[0])
 
         except Exception as e:
             print(f"Error creating user: {e}")
-            return False
-
-    def generate_id(self) -> int:
-        """
-        Uses execute_query() which opens/closes connection automatically.
-        """
-        query = "SELECT MAX(ID) as MAX_ID FROM CLIENTS"
-        rows = self.execute_query(query)  # returns a list of dicts
-        max_id = rows[0]["MAX_ID"] if rows and rows[0]["MAX_ID"] else 0
-        return max_id + 1
+            return None
 
-    def update_profile(self, email: str, data: dict) -> bool:
+    async def update_profile(self, email: str, data: dict) -> bool:
         # If you know you have all fields, this is easy
         sql = """
             UPDATE CLIENTS
@@ -102,30 +109,133 @@ class UserRepository(BaseRepository):
             "email": email,
         }
         try:
-            self.execute_non_query(sql, params)
+            await self.execute_non_query(sql, params)
             return True
         except Exception as e:
             print(f"Error updating profile: {e}")
             return False
 
-    def redeem_credits(self, email: str) -> bool:
-        sql = """
+    async def rent_film(self, email: str, film_id: int, cost: int) -> Optional[int]:
+        """
+        Location en une transaction sur une seule session : débit conditionnel
+        des crédits (jamais sous zéro, même en concurrence), lien FILM_CLIENT
+        puis un seul commit. Le lien est tiré de FILMS : un film inconnu
+        n'insère aucune ligne et la transaction est annulée (SQLite n'applique
+        pas les clés étrangères). Retourne le solde restant, ou None si le
+        client ou le film est inconnu, s'il n'a pas assez de crédits ou si
+        l'insertion échoue.
+        """
+        debit = f"""
             UPDATE CLIENTS
-            SET CREDITS = CREDITS - 10
-            WHERE COURRIEL = :email
+            SET CREDITS = CREDITS - :cost
+            WHERE COURRIEL = :email AND CREDITS >= :cost
+            {self.dialect.returning(["ID", "CREDITS"])}
         """
-        params = {
-            "email": email,
-        }
+        link = """
+            INSERT INTO FILM_CLIENT (ID_FILM, ID_CLIENT)
+            SELECT F.ID, :client_id FROM FILMS F WHERE F.ID = :film_id
+        """
+        async with self.connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    row = await self.execute_returning(
+                        cur, debit, {"email": email, "cost": cost}, {"ID": int, "CREDITS": int}
+                    )
+                    if row is None:
+                        await conn.rollback()
+                        return None
+                    client_id, credits = row
+                    await self._execute(cur, link, {"film_id": film_id, "client_id": client_id})
+                    if cur.rowcount == 0:
+                        await conn.rollback()
+                        return None
+                await conn.commit()
+                return int(credits)
+            except Exception as e:
+                print(f"Error renting film: {e}")
+                await conn.rollback()
+                return None
 
-        try:
-            self.execute_non_query(sql, params)
-            return True
-        except Exception as e:
-            print(f"Error redeeming credits: {e}")
-            return False
+    async def rent_films(self, email: str, film_ids: List[int], cost: int) -> Optional[Dict]:
+        """
+        Panier en une transaction : verrou de la ligne CLIENTS, films existants
+        et pas encore loués retenus en une requête, débit conditionnel du
+        total, insertion des liens FILM_CLIENT par executemany, un seul commit.
+        Le verrou est pris avant de lire les locations : deux paniers
+        simultanés du même client sont sérialisés et ne paient pas deux fois
+        les mêmes films. Nombre d'allers-retours constant quelle que soit la
+        taille du panier. Retourne {"credits", "rented", "skipped"}, ou None
+        (client inconnu, crédits insuffisants, erreur).
+        """
+        ids = sorted({int(i) for i in film_ids})
+        # UPDATE neutre plutôt que SELECT ... FOR UPDATE : verrou de ligne sur
+        # Oracle, verrou d'écriture sur SQLite (qui n'a pas FOR UPDATE)
+        lock = f"""
+            UPDATE CLIENTS
+            SET CREDITS = CREDITS
+            WHERE COURRIEL = :email
+            {self.dialect.returning(["ID"])}
+        """
+        pending = f"""
+            SELECT F.ID FROM FILMS F
+            WHERE F.ID IN ({self.dialect.json_ids("film_ids")})
+            AND NOT EXISTS (
+                SELECT 1 FROM FILM_CLIENT FC
+                WHERE FC.ID_FILM = F.ID AND FC.ID_CLIENT = :client_id
+            )
+            ORDER BY F.ID
+        """
+        debit = f"""
+            UPDATE CLIENTS
+            SET CREDITS = CREDITS - :cost
+            WHERE ID = :client_id AND CREDITS >= :cost
+            {self.dialect.returning(["CREDITS"])}
+        """
+        link = """
+            INSERT INTO FILM_CLIENT (ID_FILM, ID_CLIENT)
+            VALUES (:film_id, :client_id)
+        """
+        async with self.connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    row = await self.execute_returning(cur, lock, {"email": email}, {"ID": int})
+                    if row is None:
+                        await conn.rollback()
+                        return None
+                    client_id = row[0]
+                    rows = await self.query(
+                        cur, pending, {"film_ids": json.dumps(ids), "client_id": client_id}
+                    )
+                    rented = [int(row[0]) for row in rows]
+                    row = await self.execute_returning(
+                        cur,
+                        debit,
+                        {"client_id": client_id, "cost": cost * len(rented)},
+                        {"CREDITS": int},
+                    )
+                    if row is None:
+                        await conn.rollback()
+                        return None
+                    credits = row[0]
+                    if rented:
+                        await self._execute_many(
+                            cur,
+                            link,
+                            [{"film_id": film_id, "client_id": client_id} for film_id in rented],
+                        )
+                await conn.commit()
+                selected = set(rented)
+                return {
+                    "credits": int(credits),
+                    "rented": rented,
+                    "skipped": [film_id for film_id in ids if film_id not in selected],
+                }
+            except Exception as e:
+                print(f"Error renting films: {e}")
+                await conn.rollback()
+                return None
 
-    def get_user_credits(self, email: str) -> int:
+    async def get_user_credits(self, email: str) -> int:
         sql = """
             SELECT CREDITS
             FROM CLIENTS
@@ -135,62 +245,41 @@ class UserRepository(BaseRepository):
             "email": email,
         }
         try:
-            rows = self.execute_query(sql, params)
+            rows = await self.execute_query(sql, params)
             return rows[0]["CREDITS"] if rows else 0
         except Exception as e:
             print(f"Error getting user credits: {e}")
             return -1
 
-    def link_film_to_client(self, client_id: int, film_id: int) -> bool:
-        """
-        Inserts a row into FILM_CLIENT. 
-        Returns True if successful, False otherwise.
+    async def get_rented_movies(self, email: str) -> list[Dict]:
+        sql = """
+            SELECT FILMS.ID AS FILM_ID,
+                FILMS.TITRE,
+                FILMS.ANNEE,
+                FILMS.RESUME,
+                FILMS.POSTER_URL
+            FROM FILM_CLIENT
+            JOIN FILMS ON FILM_CLIENT.ID_FILM = FILMS.ID
+            JOIN CLIENTS ON FILM_CLIENT.ID_CLIENT = CLIENTS.ID
+            WHERE CLIENTS.COURRIEL = :email
         """
-        try:
-            statement = """
-                INSERT INTO FILM_CLIENT (ID_FILM, ID_CLIENT)
-                VALUES (:film_id, :client_id)
-            """
-            self.execute_non_query(statement, {"film_id": film_id, "client_id": client_id})
-            return True
-        except Exception as e:
-            print(f"Error linking film to client: {e}")
-            return False
+        async with self.cursor() as cur:
+            raw_rows = await self.query(cur, sql, {"email": email})
 
-    def get_rented_movies(self, email: str) -> list[Dict]:
-        self.connect()
-        try:
-            sql = """
-                SELECT FILMS.ID AS FILM_ID,
-                    FILMS.TITRE,
-                    FILMS.ANNEE,
-                    FILMS.RESUME,
-                    FILMS.POSTER_URL
-                FROM FILM_CLIENT
-                JOIN FILMS ON FILM_CLIENT.ID_FILM = FILMS.ID
-                JOIN CLIENTS ON FILM_CLIENT.ID_CLIENT = CLIENTS.ID
-                WHERE CLIENTS.COURRIEL = :email
-            """
-            self.cur.execute(sql, {"email": email})
-            raw_rows = self.cur.fetchall()
-
-            results = []
-            for row in raw_rows:
-                film_id, titre, annee, resume_lob, poster_url = row
-
-                if resume_lob is not None and hasattr(resume_lob, "read"):
-                    resume_lob = resume_lob.read()
-
-                movie_dict = {
-                    "ID": film_id,
-                    "TITRE": titre,
-                    "ANNEE": annee,
-                    "RESUME": resume_lob,
-                    "POSTER_URL": poster_url
-                }
-                results.append(movie_dict)
+        results = []
+        for row in raw_rows:
+            film_id, titre, annee, resume_lob, poster_url = row
 
-            return results
-        finally:
-            self.disconnect()
+            if resume_lob is not None and hasattr(resume_lob, "read"):
+                resume_lob = resume_lob.read()
+
+            movie_dict = {
+                "ID": film_id,
+                "TITRE": titre,
+                "ANNEE": annee,
+                "RESUME": resume_lob,
+                "POSTER_URL": poster_url
+            }
+            results.append(movie_dict)
 
+        return results
\ No newline at end of file
@@ -0,0 +1,99 @@
+-- Schéma de la base Oracle transposé pour SQLite (DB_BACKEND=sqlite) :
+-- bancs d'essai et tests sans serveur de base de données.
+PRAGMA journal_mode = WAL;
+
+CREATE TABLE IF NOT EXISTS FILMS (
+    ID INTEGER PRIMARY KEY,
+    TITRE TEXT NOT NULL,
+    ANNEE INTEGER,
+    LANGUE TEXT,
+    DUREE INTEGER,
+    RESUME TEXT,
+    POSTER_URL TEXT,
+    ID_REALISATEUR INTEGER
+);
+CREATE INDEX IF NOT EXISTS FILMS_TITRE_ID_IX ON FILMS (TITRE, ID);
+
+CREATE TABLE IF NOT EXISTS GENRES (
+    ID INTEGER PRIMARY KEY,
+    NOM TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS FILM_GENRE (
+    ID_FILM INTEGER NOT NULL REFERENCES FILMS (ID),
+    ID_GENRE INTEGER NOT NULL REFERENCES GENRES (ID),
+    PRIMARY KEY (ID_FILM, ID_GENRE)
+);
+CREATE INDEX IF NOT EXISTS FILM_GENRE_GENRE_FILM_IX ON FILM_GENRE (ID_GENRE, ID_FILM);
+
+CREATE TABLE IF NOT EXISTS PAYS (
+    ID INTEGER PRIMARY KEY,
+    NOM TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS FILM_PAYS (
+    ID_FILM INTEGER NOT NULL REFERENCES FILMS (ID),
+    ID_PAYS INTEGER NOT NULL REFERENCES PAYS (ID),
+    PRIMARY KEY (ID_FILM, ID_PAYS)
+);
+
+CREATE TABLE IF NOT EXISTS PERSONNES (
+    ID INTEGER PRIMARY KEY,
+    NOM TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS ROLES (
+    ID_FILM INTEGER NOT NULL REFERENCES FILMS (ID),
+    ID_ACTEUR INTEGER NOT NULL REFERENCES PERSONNES (ID),
+    PERSONNAGE TEXT
+);
+CREATE INDEX IF NOT EXISTS ROLES_FILM_IX ON ROLES (ID_FILM);
+CREATE INDEX IF NOT EXISTS ROLES_ACTEUR_FILM_IX ON ROLES (ID_ACTEUR, ID_FILM);
+
+CREATE TABLE IF NOT EXISTS SCENARISTES (
+    ID INTEGER PRIMARY KEY,
+    NOM TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS FILM_SCENARISTES (
+    ID_FILM INTEGER NOT NULL REFERENCES FILMS (ID),
+    ID_SCENARISTE INTEGER NOT NULL REFERENCES SCENARISTES (ID),
+    PRIMARY KEY (ID_FILM, ID_SCENARISTE)
+);
+CREATE INDEX IF NOT EXISTS FILM_SCENARISTES_SCEN_FILM_IX ON FILM_SCENARISTES (ID_SCENARISTE, ID_FILM);
+
+CREATE TABLE IF NOT EXISTS ANNONCES (
+    ID INTEGER PRIMARY KEY,
+    ID_FILM INTEGER NOT NULL REFERENCES FILMS (ID),
+    URL TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ANNONCES_FILM_IX ON ANNONCES (ID_FILM);
+
+CREATE TABLE IF NOT EXISTS CLIENTS (
+    ID INTEGER PRIMARY KEY,
+    COURRIEL TEXT NOT NULL UNIQUE,
+    MOT_DE_PASSE TEXT NOT NULL,
+    NOM_FAMILLE TEXT,
+    PRENOM TEXT,
+    TEL TEXT,
+    DATE_ANNIVERSAIRE TEXT,
+    ADRESSE TEXT,
+    VILLE TEXT,
+    PROVINCE TEXT,
+    CODE_POSTAL TEXT,
+    FORFAIT TEXT,
+    CREDITS INTEGER DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS FILM_CLIENT (
+    ID_FILM INTEGER NOT NULL REFERENCES FILMS (ID),
+    ID_CLIENT INTEGER NOT NULL REFERENCES CLIENTS (ID)
+);
+CREATE INDEX IF NOT EXISTS FILM_CLIENT_CLIENT_IX ON FILM_CLIENT (ID_CLIENT);
+CREATE UNIQUE INDEX IF NOT EXISTS FILM_CLIENT_UK ON FILM_CLIENT (ID_FILM, ID_CLIENT);
+
+CREATE TABLE IF NOT EXISTS CREDITS (
+    ID INTEGER PRIMARY KEY,
+    CLIENT_ID INTEGER NOT NULL REFERENCES CLIENTS (ID),
+    BALANCE INTEGER NOT NULL DEFAULT 0
+);
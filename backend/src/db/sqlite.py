@@ -0,0 +1,224 @@
+import asyncio
+import functools
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from core.config import DatabaseConfig
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "schema", "sqlite.sql")
+
+
+class SQLiteSessionPool:
+    """
+    Équivalent SQLite de SessionPool (DB_BACKEND=sqlite) : mêmes méthodes
+    et mêmes statistiques, pour mesurer les chemins chauds sans Oracle.
+    """
+
+    def __init__(self, config: DatabaseConfig):
+        self.config = config
+        self._idle: List[sqlite3.Connection] = []
+        self._slots = threading.BoundedSemaphore(config.pool_max)
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._busy = 0
+        self._acquired = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.config.sqlite_path,
+            timeout=self.config.pool_timeout / 1000,
+            check_same_thread=False,
+            cached_statements=self.config.stmt_cache_size,
+        )
+        with self._schema_lock:
+            if not self._schema_ready:
+                with open(SCHEMA_PATH, encoding="utf-8") as f:
+                    conn.executescript(f.read())
+                self._schema_ready = True
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        start = time.perf_counter()
+        waited = not self._slots.acquire(blocking=False)
+        if waited and not self._slots.acquire(timeout=self.config.pool_timeout / 1000):
+            with self._lock:
+                self._timeouts += 1
+            raise sqlite3.OperationalError("Timed out waiting for a pooled connection")
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            self._busy += 1
+            self._acquired += 1
+            if waited:
+                self._waits += 1
+                self._wait_time += time.perf_counter() - start
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                self._release_slot()
+                raise
+            with self._lock:
+                self._opened += 1
+        return conn
+
+    def _release(self, conn: sqlite3.Connection):
+        conn.rollback()
+        with self._lock:
+            self._idle.append(conn)
+        self._release_slot()
+
+    def _release_slot(self):
+        with self._lock:
+            self._busy -= 1
+        self._slots.release()
+
+    def acquire(self) -> sqlite3.Connection:
+        return self._acquire()
+
+    def release(self, conn: sqlite3.Connection):
+        self._release(conn)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+        for conn in idle:
+            conn.close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "backend": "sqlite",
+                "min": self.config.pool_min,
+                "max": self.config.pool_max,
+                "increment": self.config.pool_increment,
+                "busy": self._busy,
+                "open": self._opened,
+                "acquired": self._acquired,
+                "waits": self._waits,
+                "wait_time_ms": round(self._wait_time * 1000, 3),
+                "timeouts": self._timeouts,
+                "stmt_cache_size": self.config.stmt_cache_size,
+            }
+
+
+class AsyncSQLiteCursor:
+    """
+    Curseur au protocole de python-oracledb en mode asyncio : chaque appel
+    sqlite3 s'exécute dans un thread du pool pour ne pas bloquer l'event loop.
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor, executor: ThreadPoolExecutor):
+        self._cursor = cursor
+        self._executor = executor
+        self.prefetchrows = 0
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def arraysize(self) -> int:
+        return self._cursor.arraysize
+
+    @arraysize.setter
+    def arraysize(self, value: int):
+        self._cursor.arraysize = value
+
+    async def execute(self, statement: str, params: Optional[Dict[str, Any]] = None):
+        await self._run(self._cursor.execute, statement, params or {})
+
+    async def executemany(self, statement: str, params: List[Dict[str, Any]]):
+        await self._run(self._cursor.executemany, statement, params)
+
+    async def fetchone(self):
+        return await self._run(self._cursor.fetchone)
+
+    async def fetchmany(self, size: Optional[int] = None):
+        return await self._run(self._cursor.fetchmany, size or self._cursor.arraysize)
+
+    async def fetchall(self):
+        return await self._run(self._cursor.fetchall)
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncSQLiteConnection:
+    def __init__(self, conn: sqlite3.Connection, executor: ThreadPoolExecutor):
+        self.raw = conn
+        self._executor = executor
+
+    def cursor(self) -> AsyncSQLiteCursor:
+        return AsyncSQLiteCursor(self.raw.cursor(), self._executor)
+
+    async def commit(self):
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.raw.commit)
+
+    async def rollback(self):
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.raw.rollback)
+
+
+class AsyncSQLiteSessionPool(SQLiteSessionPool):
+    """
+    Équivalent SQLite de AsyncSessionPool. Les opérations des sessions
+    empruntées (requêtes, commit, rollback, restitution) passent par un pool
+    de threads dédié de pool_max threads, distinct du pool par défaut où
+    attendent les acquire. Au plus pool_max sessions sont empruntées et
+    chacune n'exécute qu'une opération à la fois : une transaction ouverte
+    trouve donc toujours un thread libre pour se terminer, même quand les
+    acquire en attente saturent le pool par défaut.
+    """
+
+    def __init__(self, config: DatabaseConfig):
+        super().__init__(config)
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.pool_max, thread_name_prefix="sqlite-session"
+        )
+
+    async def acquire(self) -> AsyncSQLiteConnection:
+        future = asyncio.ensure_future(asyncio.to_thread(self._acquire))
+        try:
+            conn = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Appelant annulé (client déconnecté) pendant que le thread
+            # obtenait la session : elle est rendue au pool dès son arrivée
+            future.add_done_callback(self._release_abandoned)
+            raise
+        return AsyncSQLiteConnection(conn, self._executor)
+
+    def _release_abandoned(self, future: asyncio.Future):
+        if not future.cancelled() and future.exception() is None:
+            self._release(future.result())
+
+    async def release(self, conn: AsyncSQLiteConnection):
+        # Jamais dans le pool par défaut, que les acquire en attente peuvent saturer
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._release, conn.raw
+        )
+
+    async def close(self):
+        super().close()
@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.config import get_app_config
-from api.routes import auth, movies, users
+from api.middleware import MetricsMiddleware
+from api.routes import admin, auth, metrics, movies, users
+from db.pool import close_async_session_pool, close_session_pool
 
 
 def create_app() -> FastAPI:
@@ -22,6 +24,9 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Latence, statuts et allers-retours base par route (/metrics)
+    app.add_middleware(MetricsMiddleware)
+
     # Inclusion des routers
     app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 
@@ -29,6 +34,23 @@ def create_app() -> FastAPI:
 
     app.include_router(users.router, prefix="/users", tags=["Users"])
 
+    app.include_router(admin.router, prefix="/admin", tags=["Admin"])
+
+    app.include_router(metrics.router, tags=["Admin"])
+
+    @app.on_event("startup")
+    async def startup():
+        # Index d'autocomplétion chargés en tâche de fond
+        movies.service.suggestions.start()
+        movies.service.genres.start()
+
+    @app.on_event("shutdown")
+    async def shutdown():
+        await movies.service.suggestions.stop()
+        await movies.service.genres.stop()
+        close_session_pool()
+        await close_async_session_pool()
+
     @app.get("/health")
     async def health_check():
         return {"status": "healthy"}
@@ -82,10 +82,17 @@ class MoviesPaginatedResponse(BaseModel):
     """Réponse paginée contenant une liste de films"""
 
     items: List[MovieResponse] = Field(..., description="Liste des films")
-    total: int = Field(..., description="Nombre total de films")
+    total: Optional[int] = Field(
+        None, description="Nombre total de films (absent en mode curseur)"
+    )
     page: int = Field(..., ge=1, description="Page actuelle")
     per_page: int = Field(..., gt=0, description="Nombre d'éléments par page")
-    total_pages: int = Field(..., ge=0, description="Nombre total de pages")
+    total_pages: Optional[int] = Field(
+        None, ge=0, description="Nombre total de pages (absent en mode curseur)"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Curseur à renvoyer pour obtenir la page suivante"
+    )
 
     class Config:
         schema_extra = {
@@ -103,6 +110,7 @@ class MoviesPaginatedResponse(BaseModel):
                 "page": 1,
                 "per_page": 10,
                 "total_pages": 10,
+                "next_cursor": "WyJNYXRyaXgiLCAxXQ==",
             }
         }
 
@@ -129,12 +137,24 @@ class MovieRequest(BaseModel):
         default=[], description="Liste des scénaristes"
     )
     ACTEURS: Optional[List[str]] = Field(default=[], description="Liste des acteurs")
+    # ID issus de /actor/suggestion et /director/suggestion : filtre indexé,
+    # à préférer aux noms (recherche par sous-chaîne)
+    ACTEUR_IDS: Optional[List[int]] = Field(
+        default=[], description="ID des acteurs (tous requis)"
+    )
+    SCENARISTE_IDS: Optional[List[int]] = Field(
+        default=[], description="ID des scénaristes (tous requis)"
+    )
 
     # Champs pour la pagination
     page: int = Field(default=1, ge=1, description="Numéro de la page")
     limit: int = Field(
         default=10, ge=1, le=100, description="Nombre d'éléments par page"
     )
+    cursor: Optional[str] = Field(
+        None,
+        description="Curseur next_cursor de la réponse précédente (remplace page)",
+    )
 
     class Config:
         # Permet d'utiliser les noms exacts des colonnes SQL
@@ -151,6 +171,7 @@ class MovieRequest(BaseModel):
                 "RESUME": "intelligence artificielle",
                 "GENRES_INCLUS": ["Science Fiction"],
                 "GENRES_EXCLUS": ["Horreur"],
+                "ACTEUR_IDS": [1],
                 "page": 1,
                 "limit": 10,
             }
@@ -76,5 +76,15 @@ class ClientUpdate(BaseModel):
     mot_de_passe: Optional[str] = Field(None, max_length=100)
     forfait: Optional[str] = Field(None, max_length=1)
 
+class RentRequest(BaseModel):
+    films: List[int] = Field(..., min_items=1, max_items=50)
+
+
+class RentResponse(BaseModel):
+    credits: int
+    rented: List[int]
+    skipped: List[int]
+
+
 class TokenResponse(BaseModel):
     token: str
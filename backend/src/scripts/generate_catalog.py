@@ -0,0 +1,278 @@
+"""
+Génère un catalogue synthétique (films, personnes, genres, annonces) et une
+base de clients dans la base configurée (DB_BACKEND / ORACLE_*).
+
+    cd backend/src
+    DB_BACKEND=sqlite python -m scripts.generate_catalog --films 100000 --clients 5000
+
+Les tailles suivent des distributions réalistes : popularité très inégale
+des acteurs et scénaristes (log-uniforme), RESUME en loi log-normale.
+Le catalogue est reproductible pour une même graine (--seed).
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date
+from typing import Dict, Iterable, Iterator, List
+
+from db.pool import get_session_pool
+
+GENRES = [
+    "Action", "Animation", "Aventure", "Biographie", "Comédie", "Crime",
+    "Documentaire", "Drame", "Familial", "Fantastique", "Guerre", "Histoire",
+    "Horreur", "Musical", "Mystère", "Romance", "Science Fiction", "Sport",
+    "Thriller", "Western",
+]
+PAYS = [
+    "Allemagne", "Argentine", "Australie", "Belgique", "Brésil", "Canada",
+    "Chine", "Corée du Sud", "Danemark", "Espagne", "États-Unis", "Finlande",
+    "France", "Inde", "Irlande", "Italie", "Japon", "Mexique", "Norvège",
+    "Nouvelle-Zélande", "Pays-Bas", "Pologne", "Royaume-Uni", "Russie",
+    "Suède", "Suisse",
+]
+LANGUES = ["Anglais", "Français", "Espagnol", "Allemand", "Italien", "Japonais", "Coréen"]
+PROVINCES = ["QC", "ON", "BC", "AB", "MB", "NS", "NB", "SK", "PE", "NL"]
+PRENOMS = [
+    "Alice", "Bruno", "Camille", "David", "Émilie", "François", "Gabrielle",
+    "Hugo", "Isabelle", "Julien", "Karine", "Louis", "Marie", "Nicolas",
+    "Olivia", "Pierre", "Quentin", "Rose", "Simon", "Théo", "Ursule",
+    "Victor", "William", "Xavier", "Yasmine", "Zoé",
+]
+NOMS = [
+    "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit",
+    "Durand", "Leroy", "Moreau", "Simon", "Laurent", "Lefebvre", "Michel",
+    "Garcia", "David", "Bertrand", "Roux", "Vincent", "Fournier", "Morel",
+    "Girard", "André", "Lefèvre", "Mercier", "Dupont", "Lambert", "Bonnet",
+    "Tremblay", "Gagnon", "Roy", "Côté", "Bouchard", "Gauthier", "Morin",
+]
+MOTS = [
+    "nuit", "ombre", "retour", "dernier", "secret", "ville", "mer", "guerre",
+    "amour", "étoile", "royaume", "silence", "voyage", "empire", "rivière",
+    "soleil", "fantôme", "hiver", "feu", "mémoire", "matrix", "chasseur",
+    "jardin", "tempête", "légende", "prince", "loup", "miroir", "horizon",
+    "promesse", "frontière", "éclipse", "océan", "cité", "vent", "cœur",
+]
+
+CLIENT_PASSWORD = "motdepasse"
+
+
+def _name(rng: random.Random, i: int) -> str:
+    return f"{rng.choice(PRENOMS)} {rng.choice(NOMS)} {i}"
+
+
+def _title(rng: random.Random, i: int) -> str:
+    words = rng.sample(MOTS, rng.randint(1, 4))
+    return " ".join(words).capitalize() + f" {i}"
+
+
+def _resume(rng: random.Random) -> str:
+    # Log-normale : médiane ~400 caractères, longue traîne jusqu'à 4000
+    length = min(4000, max(40, int(rng.lognormvariate(6.0, 0.7))))
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(MOTS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def _popular(rng: random.Random, count: int) -> int:
+    """ID log-uniforme : les petits ID (vedettes) reviennent très souvent"""
+    return max(1, int(count ** rng.random()))
+
+
+def _batches(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def client_email(i: int) -> str:
+    return f"client{i}@example.com"
+
+
+class CatalogGenerator:
+    def __init__(self, films: int, clients: int, seed: int, batch_size: int):
+        self.films = films
+        self.clients = clients
+        self.actors = max(10, films // 2)
+        self.scenaristes = max(5, films // 10)
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.counts: Dict[str, int] = {}
+
+    def _insert(self, conn, table: str, rows: Iterable[Dict]):
+        total = 0
+        for batch in _batches(rows, self.batch_size):
+            columns = list(batch[0])
+            statement = (
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(':' + c.lower() for c in columns)})"
+            )
+            binds = [{c.lower(): row[c] for c in columns} for row in batch]
+            cur = conn.cursor()
+            try:
+                cur.executemany(statement, binds)
+            finally:
+                cur.close()
+            conn.commit()
+            total += len(batch)
+        self.counts[table] = self.counts.get(table, 0) + total
+
+    def reset(self, conn):
+        cur = conn.cursor()
+        try:
+            for table in (
+                "FILM_CLIENT", "CREDITS", "CLIENTS", "ANNONCES", "ROLES",
+                "FILM_SCENARISTES", "FILM_PAYS", "FILM_GENRE", "FILMS",
+                "SCENARISTES", "PERSONNES", "PAYS", "GENRES",
+            ):
+                cur.execute(f"DELETE FROM {table}")
+        finally:
+            cur.close()
+        conn.commit()
+
+    def _films(self) -> Iterator[Dict]:
+        rng = self.rng
+        for i in range(1, self.films + 1):
+            yield {
+                "ID": i,
+                "TITRE": _title(rng, i),
+                "ANNEE": rng.randint(1920, 2025),
+                "LANGUE": rng.choice(LANGUES),
+                "DUREE": rng.randint(75, 200),
+                "RESUME": _resume(rng),
+                "POSTER_URL": f"https://images.example.com/posters/{i}.jpg",
+                "ID_REALISATEUR": rng.randint(1, self.actors),
+            }
+
+    def _links(self, target: str, pick, low: int, high: int) -> Iterator[Dict]:
+        rng = self.rng
+        for film_id in range(1, self.films + 1):
+            for target_id in {pick() for _ in range(rng.randint(low, high))}:
+                yield {"ID_FILM": film_id, target: target_id}
+
+    def _roles(self) -> Iterator[Dict]:
+        rng = self.rng
+        for film_id in range(1, self.films + 1):
+            cast = {rng.randint(1, self.actors) for _ in range(rng.randint(2, 12))}
+            # Quelques vedettes présentes dans beaucoup de films
+            cast.update(_popular(rng, self.actors) for _ in range(rng.randint(0, 3)))
+            for actor_id in cast:
+                yield {
+                    "ID_FILM": film_id,
+                    "ID_ACTEUR": actor_id,
+                    "PERSONNAGE": f"{rng.choice(PRENOMS)} {rng.choice(NOMS)}",
+                }
+
+    def _annonces(self) -> Iterator[Dict]:
+        rng = self.rng
+        annonce_id = 0
+        for film_id in range(1, self.films + 1):
+            for _ in range(rng.choice((0, 1, 1, 1, 2))):
+                annonce_id += 1
+                yield {
+                    "ID": annonce_id,
+                    "ID_FILM": film_id,
+                    "URL": f"https://videos.example.com/trailers/{annonce_id}.mp4",
+                }
+
+    def _clients(self) -> Iterator[Dict]:
+        rng = self.rng
+        for i in range(1, self.clients + 1):
+            # ID attribué par la base (séquence CLIENTS_SEQ, migration 004)
+            yield {
+                "COURRIEL": client_email(i),
+                "MOT_DE_PASSE": CLIENT_PASSWORD,
+                "NOM_FAMILLE": rng.choice(NOMS),
+                "PRENOM": rng.choice(PRENOMS),
+                "TEL": f"514-555-{rng.randint(0, 9999):04d}",
+                "DATE_ANNIVERSAIRE": date(rng.randint(1940, 2006), rng.randint(1, 12), rng.randint(1, 28)),
+                "ADRESSE": f"{rng.randint(1, 9999)} rue {rng.choice(NOMS)}",
+                "VILLE": "Montréal",
+                "PROVINCE": rng.choice(PROVINCES),
+                "CODE_POSTAL": f"H{rng.randint(0, 9)}X {rng.randint(0, 9)}A{rng.randint(0, 9)}",
+                "FORFAIT": rng.choice("BIA"),
+                "CREDITS": 1_000_000,
+            }
+
+    def run(self, conn):
+        self._insert(conn, "GENRES", ({"ID": i, "NOM": n} for i, n in enumerate(GENRES, 1)))
+        self._insert(conn, "PAYS", ({"ID": i, "NOM": n} for i, n in enumerate(PAYS, 1)))
+        self._insert(
+            conn,
+            "PERSONNES",
+            ({"ID": i, "NOM": _name(self.rng, i)} for i in range(1, self.actors + 1)),
+        )
+        self._insert(
+            conn,
+            "SCENARISTES",
+            ({"ID": i, "NOM": _name(self.rng, i)} for i in range(1, self.scenaristes + 1)),
+        )
+        rng = self.rng
+        self._insert(conn, "FILMS", self._films())
+        self._insert(
+            conn,
+            "FILM_GENRE",
+            self._links("ID_GENRE", lambda: rng.randint(1, len(GENRES)), 1, 3),
+        )
+        self._insert(
+            conn, "FILM_PAYS", self._links("ID_PAYS", lambda: _popular(rng, len(PAYS)), 1, 2)
+        )
+        self._insert(
+            conn,
+            "FILM_SCENARISTES",
+            self._links("ID_SCENARISTE", lambda: _popular(rng, self.scenaristes), 1, 3),
+        )
+        self._insert(conn, "ROLES", self._roles())
+        self._insert(conn, "ANNONCES", self._annonces())
+        self._insert(conn, "CLIENTS", self._clients())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--films", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument(
+        "--reset", action="store_true", help="Vide les tables avant la génération"
+    )
+    args = parser.parse_args()
+
+    generator = CatalogGenerator(args.films, args.clients, args.seed, args.batch_size)
+    pool = get_session_pool()
+    conn = pool.acquire()
+    start = time.perf_counter()
+    try:
+        if args.reset:
+            generator.reset(conn)
+        generator.run(conn)
+    finally:
+        pool.release(conn)
+        pool.close()
+
+    print(
+        json.dumps(
+            {
+                "films": args.films,
+                "clients": args.clients,
+                "seed": args.seed,
+                "rows": generator.counts,
+                "elapsed_s": round(time.perf_counter() - start, 3),
+                "client_password": CLIENT_PASSWORD,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Rejoue un mélange de requêtes sur l'API à un débit cible et mesure
+débit et latences (p50/p95/p99) par route, en JSON.
+
+    cd backend/src
+    python -m scripts.load_test --url http://localhost:8000 --rps 200 \\
+        --duration 60 --films 100000 --clients 5000 --output bench.json
+
+Le catalogue doit correspondre à celui de scripts.generate_catalog
+(mêmes --films / --clients). La charge est en boucle ouverte : les
+requêtes partent à l'heure prévue, même si les précédentes n'ont pas
+répondu, afin que les ralentissements du serveur se voient dans les
+percentiles au lieu de réduire le débit.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from scripts.generate_catalog import CLIENT_PASSWORD, GENRES, MOTS, client_email
+
+DEFAULT_MIX = "search=30,movie=30,suggestion=20,actor_suggestion=5,login=10,rent=5"
+
+
+class Connection:
+    """Connexion HTTP/1.1 keep-alive minimale (bibliothèque standard)"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(
+        self, method: str, path: str, body: Optional[bytes] = None, headers: Dict = None
+    ) -> Tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        if body is not None:
+            lines.append("Content-Type: application/json")
+            lines.append(f"Content-Length: {len(body)}")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server")
+        status = int(status_line.split()[1])
+        length = 0
+        chunked = False
+        close = False
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            value = value.strip()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding" and "chunked" in value.lower():
+                chunked = True
+            elif name == "connection" and value.lower() == "close":
+                close = True
+
+        if chunked:
+            parts = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                parts.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            payload = b"".join(parts)
+        else:
+            payload = await self.reader.readexactly(length) if length else b""
+        if close:
+            self.close()
+        return status, payload
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class LoadTest:
+    def __init__(self, args):
+        url = urlsplit(args.url)
+        self.host = url.hostname or "localhost"
+        self.port = url.port or 80
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.mix = self._parse_mix(args.mix)
+        self.idle: List[Connection] = []
+        self.slots = asyncio.Semaphore(args.connections)
+        self.tokens: Dict[int, str] = {}
+        self.latencies: Dict[str, List[float]] = {route: [] for route, _ in self.mix}
+        self.statuses: Dict[str, Dict[str, int]] = {route: {} for route, _ in self.mix}
+        self.errors: Dict[str, int] = {route: 0 for route, _ in self.mix}
+        self.dropped = 0
+
+    @staticmethod
+    def _parse_mix(mix: str) -> List[Tuple[str, float]]:
+        weights = []
+        for item in mix.split(","):
+            route, _, weight = item.partition("=")
+            if not hasattr(LoadTest, f"_{route.strip()}"):
+                raise SystemExit(f"Unknown route in mix: {route}")
+            weights.append((route.strip(), float(weight or 1)))
+        return weights
+
+    def _film_id(self) -> int:
+        # Les fiches populaires sont plus demandées (log-uniforme)
+        return max(1, int(self.args.films ** self.rng.random()))
+
+    def _term(self) -> str:
+        word = self.rng.choice(MOTS)
+        return word[: self.rng.randint(2, len(word))]
+
+    async def _call(self, method: str, path: str, payload=None, headers=None) -> Tuple[int, bytes]:
+        conn = self.idle.pop() if self.idle else Connection(self.host, self.port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        try:
+            result = await conn.request(method, path, body, headers)
+        except Exception:
+            conn.close()
+            raise
+        self.idle.append(conn)
+        return result
+
+    async def _search(self):
+        payload = {"limit": 10, "page": self.rng.randint(1, 5)}
+        if self.rng.random() < 0.6:
+            payload["TITRE"] = self._term()
+        if self.rng.random() < 0.4:
+            payload["GENRES_INCLUS"] = [self.rng.choice(GENRES)]
+        if self.rng.random() < 0.2:
+            payload["ANNEE"] = self.rng.randint(1950, 2025)
+        if self.rng.random() < 0.1:
+            payload["ACTEUR_IDS"] = [max(1, int((self.args.films // 2) ** self.rng.random()))]
+        return await self._call("POST", "/movies/", payload)
+
+    async def _movie(self):
+        return await self._call("GET", f"/movies/movie/{self._film_id()}")
+
+    async def _suggestion(self):
+        return await self._call("GET", f"/movies/suggestions/{quote(self._term())}")
+
+    async def _actor_suggestion(self):
+        return await self._call("GET", f"/movies/actor/suggestion/{quote(self._term())}")
+
+    async def _login_as(self, client: int) -> Tuple[int, bytes]:
+        status, body = await self._call(
+            "POST",
+            "/auth/login",
+            {"courriel": client_email(client), "mot_de_passe": CLIENT_PASSWORD},
+        )
+        if status == 200:
+            self.tokens[client] = json.loads(body)["token"]
+        return status, body
+
+    async def _login(self):
+        return await self._login_as(self.rng.randint(1, self.args.clients))
+
+    async def _rent(self):
+        client = self.rng.randint(1, self.args.clients)
+        if client not in self.tokens:
+            status, body = await self._login_as(client)
+            if status != 200:
+                return status, body
+        headers = {"Authorization": f"Bearer {self.tokens[client]}"}
+        return await self._call("POST", f"/users/rent/{self._film_id()}", None, headers)
+
+    async def _run_one(self, route: str):
+        try:
+            start = time.perf_counter()
+            try:
+                status, _ = await getattr(self, f"_{route}")()
+            except Exception:
+                self.errors[route] += 1
+                return
+            elapsed = time.perf_counter() - start
+            self.latencies[route].append(elapsed)
+            self.statuses[route][str(status)] = self.statuses[route].get(str(status), 0) + 1
+            if status >= 500:
+                self.errors[route] += 1
+        finally:
+            self.slots.release()
+
+    async def run(self) -> Dict:
+        routes = [route for route, _ in self.mix]
+        weights = [weight for _, weight in self.mix]
+        interval = 1.0 / self.args.rps
+        tasks = set()
+        start = time.perf_counter()
+        deadline = start + self.args.duration
+        next_at = start
+        while next_at < deadline:
+            now = time.perf_counter()
+            if next_at > now:
+                await asyncio.sleep(next_at - now)
+            next_at += interval
+            if self.slots.locked():
+                # Toutes les connexions sont occupées : requête perdue, comptée
+                self.dropped += 1
+                continue
+            await self.slots.acquire()
+            route = self.rng.choices(routes, weights)[0]
+            task = asyncio.ensure_future(self._run_one(route))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+        elapsed = time.perf_counter() - start
+        for conn in self.idle:
+            conn.close()
+        return self._report(elapsed)
+
+    def _report(self, elapsed: float) -> Dict:
+        routes = {}
+        total = 0
+        for route, samples in self.latencies.items():
+            total += len(samples)
+            routes[route] = {
+                "requests": len(samples),
+                "errors": self.errors[route],
+                "throughput_rps": round(len(samples) / elapsed, 2),
+                "statuses": self.statuses[route],
+                **latency_summary(samples),
+            }
+        everything = [s for samples in self.latencies.values() for s in samples]
+        return {
+            "commit": git_commit(),
+            "url": self.args.url,
+            "target_rps": self.args.rps,
+            "duration_s": round(elapsed, 3),
+            "connections": self.args.connections,
+            "requests": total,
+            "dropped": self.dropped,
+            "throughput_rps": round(total / elapsed, 2),
+            "latency": latency_summary(everything),
+            "routes": routes,
+        }
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """Percentile par rang le plus proche, sur un échantillon trié"""
+    if not samples:
+        return 0.0
+    rank = max(0, min(len(samples) - 1, math.ceil(p / 100 * len(samples)) - 1))
+    return samples[rank]
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    summary = {
+        f"p{p}_ms": round(percentile(ordered, p) * 1000, 3) for p in (50, 95, 99)
+    }
+    summary["max_ms"] = round(ordered[-1] * 1000, 3) if ordered else 0.0
+    return summary
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--rps", type=float, default=50)
+    parser.add_argument("--duration", type=float, default=30, help="secondes")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--films", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=1_000)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="route=poids,...")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Fichier JSON (sinon sortie standard)")
+    args = parser.parse_args()
+
+    report = asyncio.run(LoadTest(args).run())
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,354 @@
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from core.config import get_app_config
+from services.cache_backends import (
+    CacheBackend,
+    MemoryBackend,
+    create_backend,
+    get_invalidation_bus,
+)
+
+
+class StaleEntry:
+    """
+    Enveloppe stale-while-revalidate : la donnée reste servie après
+    fresh_until (horloge murale, partagée entre workers) pendant qu'un
+    rafraîchissement tourne en arrière-plan.
+    """
+
+    __slots__ = ("data", "fresh_until")
+
+    def __init__(self, data: Any, fresh_until: float):
+        self.data = data
+        self.fresh_until = fresh_until
+
+    def __getstate__(self):
+        return (self.data, self.fresh_until)
+
+    def __setstate__(self, state):
+        self.data, self.fresh_until = state
 
 
 class CacheService:
-    def __init__(self):
-        # Structure simple: { "clé": {"data": données, "expiry": date_expiration} }
-        self.cache = {}
+    """
+    Cache nommé avec expiration, adossé à un backend interchangeable
+    (CACHE_BACKEND) : LRU en mémoire du processus, fichier SQLite partagé
+    par les workers de l'hôte, ou serveur Redis.
+
+    Les entrées peuvent porter des tags (ex. "client:<courriel>") ;
+    invalidate() supprime toutes les entrées d'un tag, dans tous les workers.
+
+    Avec stale_minutes, get_or_load() sert encore la donnée après `minutes`
+    et la rafraîchit en tâche de fond ; elle n'est retirée qu'après
+    minutes + stale_minutes, ou si la base reste injoignable au-delà de
+    CACHE_STALE_GRACE_MINUTES.
+    """
 
-    def get(self, key: str) -> Optional[Any]:
+    def __init__(
+        self,
+        name: str = "default",
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        backend: Optional[CacheBackend] = None,
+    ):
+        config = get_app_config()
+        self.name = name
+        self.backend = backend or create_backend(
+            name,
+            max_entries or config.CACHE_MAX_ENTRIES,
+            max_bytes or config.CACHE_MAX_BYTES,
+            config,
+        )
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+        self._coalesced = 0
+        self._invalidations = 0
+        self._stale_hits = 0
+        self._refreshes = 0
+        self._refresh_errors = 0
+        self.stale_grace = config.CACHE_STALE_GRACE_MINUTES * 60
+        # Chargements en cours, par clé (single-flight) : seuls les échecs
+        # de lecture s'y joignent
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Rafraîchissements en arrière-plan des entrées périmées, à part : ils
+        # ne retournent rien et un échec de lecture ne doit pas les attendre
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        # Incrémenté à chaque invalidation d'un tag : un chargement commencé
+        # avant l'invalidation ne doit pas réécrire une donnée périmée
+        self._generations: Dict[str, int] = {}
+        self._bus = None
+        if isinstance(self.backend, MemoryBackend):
+            # Backend propre au processus : les autres workers sont prévenus
+            # par le journal d'invalidations partagé
+            self._bus = get_invalidation_bus(config)
+            self._bus.subscribe(name, self._apply_invalidation)
+        _sweeper.register(self)
+
+    async def _io(self, fn: Callable, *args):
+        """Appel au backend, dans un thread si ses E/S sont bloquantes"""
+        if self.backend.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def get(self, key: str) -> Optional[Any]:
         """Récupère une donnée du cache"""
-        if key in self.cache:
-            # Vérifie si la donnée n'a pas expiré
-            if datetime.now() < self.cache[key]["expiry"]:
-                return self.cache[key]["data"]
-            del self.cache[key]
-        return None
-
-    def set(self, key: str, data: Any, minutes: int = 30):
+        data = await self._read(key)
+        if isinstance(data, StaleEntry):
+            return data.data
+        return data
+
+    async def _read(self, key: str) -> Optional[Any]:
+        try:
+            data = await self._io(self.backend.get, key)
+        except Exception as e:
+            # Un backend partagé indisponible ne doit pas faire échouer la requête
+            print(f"Error reading cache {self.name}: {e}")
+            data = None
+            with self._lock:
+                self._errors += 1
+        with self._lock:
+            if data is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return data
+
+    async def set(
+        self,
+        key: str,
+        data: Any,
+        minutes: int = 30,
+        tags: Iterable[str] = (),
+        stale_minutes: int = 0,
+    ):
         """Stocke une donnée dans le cache pour X minutes"""
-        self.cache[key] = {
-            "data": data,
-            "expiry": datetime.now() + timedelta(minutes=minutes),
-        }
+        ttl = minutes * 60
+        if stale_minutes:
+            data = StaleEntry(data, time.time() + ttl)
+            ttl += stale_minutes * 60
+        try:
+            await self._io(self.backend.set, key, data, ttl, tags)
+        except Exception as e:
+            print(f"Error writing cache {self.name}: {e}")
+            with self._lock:
+                self._errors += 1
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        minutes: int = 30,
+        tags: Iterable[str] = (),
+        stale_minutes: int = 0,
+    ) -> Any:
+        """
+        Retourne la donnée en cache ou la charge avec `loader`.
+        Les requêtes concurrentes sur une même clé absente attendent un
+        unique chargement au lieu d'interroger toutes la base.
+        """
+        tags = tuple(tags)
+        data = await self._read(key)
+        if isinstance(data, StaleEntry):
+            if time.time() >= data.fresh_until and key not in self._refreshing:
+                with self._lock:
+                    self._stale_hits += 1
+                self._refreshing[key] = asyncio.ensure_future(
+                    self._refresh(key, loader, minutes, tags, stale_minutes, data)
+                )
+            return data.data
+        if data is not None:
+            return data
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._load(key, loader, minutes, tags, stale_minutes)
+            )
+            self._inflight[key] = task
+        else:
+            with self._lock:
+                self._coalesced += 1
+        # shield : l'annulation d'un client n'interrompt pas le chargement partagé
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        minutes: int,
+        tags: tuple,
+        stale_minutes: int = 0,
+    ):
+        try:
+            return await self._fetch(key, loader, minutes, tags, stale_minutes)
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _fetch(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        minutes: int,
+        tags: tuple,
+        stale_minutes: int,
+    ):
+        """Appelle `loader` et écrit le résultat s'il n'a pas été invalidé entre-temps"""
+        generations = [self._generations.get(tag, 0) for tag in tags]
+        data = await loader()
+        current = [self._generations.get(tag, 0) for tag in tags]
+        if data and generations == current:
+            await self.set(key, data, minutes, tags, stale_minutes)
+        return data
+
+    async def _refresh(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        minutes: int,
+        tags: tuple,
+        stale_minutes: int,
+        stale: StaleEntry,
+    ):
+        """Rafraîchissement en arrière-plan d'une entrée périmée"""
+        with self._lock:
+            self._refreshes += 1
+        try:
+            if not await self._fetch(key, loader, minutes, tags, stale_minutes):
+                # La donnée n'existe plus en base
+                await self.delete(key)
+        except Exception as e:
+            print(f"Error refreshing cache {self.name} entry {key}: {e}")
+            with self._lock:
+                self._refresh_errors += 1
+            # Base injoignable trop longtemps : on cesse de servir la donnée
+            if time.time() - stale.fresh_until > self.stale_grace:
+                await self.delete(key)
+        finally:
+            self._refreshing.pop(key, None)
+
+    async def invalidate(self, *tags: str) -> int:
+        """Supprime les entrées des tags ici et dans les autres workers"""
+        tags = list(tags)
+        self._bump_generations(tags)
+        removed = await self._io(self._invalidate_backend, tags)
+        if self._bus is not None:
+            try:
+                # Journal partagé sur fichier : hors de l'event loop
+                await asyncio.to_thread(self._bus.publish, self.name, tags)
+            except Exception as e:
+                print(f"Error publishing cache invalidation {self.name}: {e}")
+        return removed
 
-    def delete(self, key: str):
+    def _apply_invalidation(self, tags: List[str]) -> int:
+        """Invalidation reçue d'un autre worker (thread du journal partagé)"""
+        self._bump_generations(tags)
+        return self._invalidate_backend(tags)
+
+    def _bump_generations(self, tags: List[str]):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            self._invalidations += len(tags)
+
+    def _invalidate_backend(self, tags: List[str]) -> int:
+        try:
+            return self.backend.invalidate_tags(tags)
+        except Exception as e:
+            print(f"Error invalidating cache {self.name}: {e}")
+            with self._lock:
+                self._errors += 1
+            return 0
+
+    async def delete(self, key: str):
         """Supprime une donnée du cache"""
-        if key in self.cache:
-            del self.cache[key]
+        await self._io(self.backend.delete, key)
 
-    def clear(self):
+    async def clear(self):
         """Vide tout le cache"""
-        self.cache.clear()
+        await self._io(self.backend.clear)
+
+    def sweep(self):
+        """Purge les entrées expirées (appelé périodiquement)"""
+        self.backend.sweep()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            stats = {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "errors": self._errors,
+                "coalesced": self._coalesced,
+                "invalidations": self._invalidations,
+                "stale_hits": self._stale_hits,
+                "refreshes": self._refreshes,
+                "refresh_errors": self._refresh_errors,
+            }
+        try:
+            stats.update(self.backend.stats())
+        except Exception as e:
+            stats["backend_error"] = str(e)
+        return stats
+
+
+class _Sweeper:
+    """Thread de fond unique qui purge les caches enregistrés"""
+
+    def __init__(self):
+        self._caches: Dict[str, CacheService] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, cache: CacheService):
+        with self._lock:
+            self._caches[cache.name] = cache
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="cache-sweeper", daemon=True
+                )
+                self._thread.start()
+
+    def caches(self) -> Dict[str, CacheService]:
+        with self._lock:
+            return dict(self._caches)
+
+    def _run(self):
+        interval = get_app_config().CACHE_SWEEP_SECONDS
+        while True:
+            time.sleep(interval)
+            for cache in self.caches().values():
+                try:
+                    cache.sweep()
+                except Exception as e:
+                    print(f"Error sweeping cache {cache.name}: {e}")
+
+
+_sweeper = _Sweeper()
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str) -> CacheService:
+    """Cache nommé partagé par toutes les instances d'un service"""
+    with _caches_lock:
+        cache = _sweeper.caches().get(name)
+        if cache is None:
+            cache = CacheService(name)
+        return cache
+
+
+async def invalidate_all(*tags: str) -> int:
+    """Invalide les tags dans tous les caches nommés"""
+    removed = 0
+    for cache in _sweeper.caches().values():
+        removed += await cache.invalidate(*tags)
+    return removed
+
+
+def get_cache_stats() -> Dict[str, Dict]:
+    return {name: cache.stats() for name, cache in _sweeper.caches().items()}
@@ -0,0 +1,643 @@
+import heapq
+import os
+import pickle
+import secrets
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Au-delà de cette taille, les valeurs sérialisées sont compressées
+COMPRESS_THRESHOLD = 1024
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+
+
+def serialize(data: Any) -> bytes:
+    """Sérialisation binaire compacte (pickle, zlib pour les grosses valeurs)"""
+    raw = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(raw) > COMPRESS_THRESHOLD:
+        return _ZLIB + zlib.compress(raw, 1)
+    return _RAW + raw
+
+
+def deserialize(payload: bytes) -> Any:
+    if payload[:1] == _ZLIB:
+        return pickle.loads(zlib.decompress(payload[1:]))
+    return pickle.loads(payload[1:])
+
+
+def _sizeof(data: Any, depth: int = 0) -> int:
+    """Estimation de l'empreinte mémoire d'une donnée mise en cache"""
+    size = sys.getsizeof(data)
+    if depth > 4:
+        return size
+    if isinstance(data, dict):
+        size += sum(
+            _sizeof(k, depth + 1) + _sizeof(v, depth + 1) for k, v in data.items()
+        )
+    elif isinstance(data, (list, tuple, set, frozenset)):
+        size += sum(_sizeof(item, depth + 1) for item in data)
+    elif hasattr(data, "__slots__"):
+        size += sum(
+            _sizeof(getattr(data, attr), depth + 1)
+            for attr in data.__slots__
+            if hasattr(data, attr)
+        )
+    return size
+
+
+class CacheBackend:
+    """
+    Stockage d'un cache nommé. `ttl` est en secondes ; get() ne renvoie
+    jamais une entrée expirée.
+    """
+
+    # E/S bloquantes (fichier, réseau) : CacheService appelle alors le
+    # backend depuis un thread plutôt que sur l'event loop
+    blocking = False
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, data: Any, ttl: float, tags: Iterable[str] = ()):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Supprime toutes les entrées associées à l'un des tags"""
+        raise NotImplementedError
+
+    def sweep(self):
+        """Purge des entrées expirées, appelée périodiquement"""
+
+    def stats(self) -> Dict:
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    """
+    LRU borné (entrées et/ou octets) propre au processus.
+    Horloge monotone ; aucune sérialisation.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # { "clé": (données, expiration, taille, tags) }, du moins au plus récent
+        self.cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._expiries: List[tuple] = []
+        self._tags: Dict[str, set] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[1]:
+                self._remove(key)
+                self._expirations += 1
+                return None
+            self.cache.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, data: Any, ttl: float, tags: Iterable[str] = ()):
+        expiry = time.monotonic() + ttl
+        size = _sizeof(data)
+        tags = tuple(tags)
+        with self._lock:
+            if key in self.cache:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self.cache[key] = (data, expiry, size, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            self._bytes += size
+            heapq.heappush(self._expiries, (expiry, key))
+            while len(self.cache) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self.cache))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self.cache:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.cache.clear()
+            self._expiries = []
+            self._tags = {}
+            self._bytes = 0
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if key in self.cache:
+                        self._remove(key)
+                        removed += 1
+        return removed
+
+    def sweep(self):
+        now = time.monotonic()
+        with self._lock:
+            while self._expiries and self._expiries[0][0] <= now:
+                expiry, key = heapq.heappop(self._expiries)
+                entry = self.cache.get(key)
+                # L'entrée a pu être remplacée depuis avec une autre expiration
+                if entry is not None and entry[1] == expiry:
+                    self._remove(key)
+                    self._expirations += 1
+            # Le tas garde des entrées périmées après les remplacements
+            if len(self._expiries) > 2 * len(self.cache) + 1024:
+                self._expiries = [(entry[1], key) for key, entry in self.cache.items()]
+                heapq.heapify(self._expiries)
+
+    def _remove(self, key: str):
+        _, _, size, tags = self.cache.pop(key)
+        self._bytes -= size
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self.cache),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Cache partagé par tous les workers d'un hôte via un fichier SQLite (WAL).
+    Les expirations utilisent l'horloge murale, commune aux processus ;
+    l'éviction retire les entrées les plus anciennes du cache nommé.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, namespace: str, max_entries: int, max_bytes: int):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._evictions = 0
+        self._expirations = 0
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS CACHE_ENTRIES (
+                    NAMESPACE TEXT NOT NULL,
+                    KEY TEXT NOT NULL,
+                    VALUE BLOB NOT NULL,
+                    SIZE INTEGER NOT NULL,
+                    EXPIRY REAL NOT NULL,
+                    STORED REAL NOT NULL,
+                    PRIMARY KEY (NAMESPACE, KEY)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS CACHE_ENTRIES_EXPIRY_IX ON CACHE_ENTRIES (EXPIRY)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS CACHE_TAGS (
+                    NAMESPACE TEXT NOT NULL,
+                    TAG TEXT NOT NULL,
+                    KEY TEXT NOT NULL,
+                    PRIMARY KEY (NAMESPACE, TAG, KEY)
+                )
+                """
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # Une connexion par thread : sqlite3 ne les partage pas
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._connection().execute(
+            "SELECT VALUE FROM CACHE_ENTRIES WHERE NAMESPACE = ? AND KEY = ? AND EXPIRY > ?",
+            (self.namespace, key, time.time()),
+        ).fetchone()
+        return deserialize(row[0]) if row else None
+
+    def set(self, key: str, data: Any, ttl: float, tags: Iterable[str] = ()):
+        payload = serialize(data)
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO CACHE_ENTRIES
+                    (NAMESPACE, KEY, VALUE, SIZE, EXPIRY, STORED)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (self.namespace, key, payload, len(payload), now + ttl, now),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO CACHE_TAGS (NAMESPACE, TAG, KEY) VALUES (?, ?, ?)",
+                [(self.namespace, tag, key) for tag in tags],
+            )
+
+    def delete(self, key: str):
+        self._connection().execute(
+            "DELETE FROM CACHE_ENTRIES WHERE NAMESPACE = ? AND KEY = ?",
+            (self.namespace, key),
+        )
+
+    def clear(self):
+        conn = self._connection()
+        conn.execute("DELETE FROM CACHE_ENTRIES WHERE NAMESPACE = ?", (self.namespace,))
+        conn.execute("DELETE FROM CACHE_TAGS WHERE NAMESPACE = ?", (self.namespace,))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        removed = 0
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN")
+            for tag in tags:
+                removed += conn.execute(
+                    """
+                    DELETE FROM CACHE_ENTRIES WHERE NAMESPACE = ? AND KEY IN (
+                        SELECT KEY FROM CACHE_TAGS WHERE NAMESPACE = ? AND TAG = ?
+                    )
+                    """,
+                    (self.namespace, self.namespace, tag),
+                ).rowcount
+                conn.execute(
+                    "DELETE FROM CACHE_TAGS WHERE NAMESPACE = ? AND TAG = ?",
+                    (self.namespace, tag),
+                )
+        return removed
+
+    def sweep(self):
+        conn = self._connection()
+        deleted = conn.execute(
+            "DELETE FROM CACHE_ENTRIES WHERE NAMESPACE = ? AND EXPIRY <= ?",
+            (self.namespace, time.time()),
+        ).rowcount
+        self._expirations += max(deleted, 0)
+        conn.execute(
+            """
+            DELETE FROM CACHE_TAGS WHERE NAMESPACE = ? AND KEY NOT IN (
+                SELECT KEY FROM CACHE_ENTRIES WHERE NAMESPACE = ?
+            )
+            """,
+            (self.namespace, self.namespace),
+        )
+
+        entries, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(SIZE), 0) FROM CACHE_ENTRIES WHERE NAMESPACE = ?",
+            (self.namespace,),
+        ).fetchone()
+        while entries > self.max_entries or size > self.max_bytes:
+            excess = max(entries - self.max_entries, 1)
+            deleted = conn.execute(
+                """
+                DELETE FROM CACHE_ENTRIES WHERE NAMESPACE = ? AND KEY IN (
+                    SELECT KEY FROM CACHE_ENTRIES WHERE NAMESPACE = ?
+                    ORDER BY STORED LIMIT ?
+                )
+                """,
+                (self.namespace, self.namespace, excess),
+            ).rowcount
+            self._evictions += max(deleted, 0)
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(SIZE), 0) FROM CACHE_ENTRIES WHERE NAMESPACE = ?",
+                (self.namespace,),
+            ).fetchone()
+
+    def stats(self) -> Dict:
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(SIZE), 0) FROM CACHE_ENTRIES WHERE NAMESPACE = ?",
+            (self.namespace,),
+        ).fetchone()
+        return {
+            "backend": "sqlite",
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
+
+
+class RedisError(Exception):
+    pass
+
+
+# KEYS[1] : entrée, KEYS[2..] : ensembles des tags ; ARGV : valeur, TTL (ms).
+# Le TTL d'un tag suit l'entrée la plus durable qui le porte : une entrée
+# brève ne fait pas expirer le tag de ses voisines encore en cache.
+SET_WITH_TAGS_SCRIPT = b"""
+local ttl = tonumber(ARGV[2])
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ttl)
+for i = 2, #KEYS do
+    redis.call('SADD', KEYS[i], KEYS[1])
+    if redis.call('PTTL', KEYS[i]) < ttl then
+        redis.call('PEXPIRE', KEYS[i], ttl)
+    end
+end
+return 1
+"""
+
+
+class RedisBackend(CacheBackend):
+    """
+    Cache partagé via le protocole Redis (RESP2), sans dépendance externe.
+    L'expiration et l'éviction sont déléguées au serveur (PX, maxmemory).
+    Expérimental : le script Lua n'a été exercé que contre un faux serveur RESP.
+    """
+
+    blocking = True
+
+    def __init__(self, url: str, namespace: str):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.namespace = namespace
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _key(self, key: str) -> bytes:
+        return f"{self.namespace}:{key}".encode("utf-8")
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=2)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._send(b"AUTH", self.password.encode("utf-8"))
+        if self.db:
+            self._send(b"SELECT", str(self.db).encode("ascii"))
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+                self._reader = None
+
+    def _send(self, *args: bytes):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b"+":
+            return body
+        if prefix == b"-":
+            raise RedisError(body.decode("utf-8", "replace"))
+        if prefix == b":":
+            return int(body)
+        if prefix == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def command(self, *args: bytes):
+        with self._lock:
+            for attempt in (1, 2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._send(*args)
+                except (OSError, ConnectionError):
+                    self._close()
+                    if attempt == 2:
+                        raise
+
+    def get(self, key: str) -> Optional[Any]:
+        payload = self.command(b"GET", self._key(key))
+        return deserialize(payload) if payload is not None else None
+
+    def _tag_key(self, tag: str) -> bytes:
+        return f"{self.namespace}:tag:{tag}".encode("utf-8")
+
+    def set(self, key: str, data: Any, ttl: float, tags: Iterable[str] = ()):
+        ttl_ms = str(max(int(ttl * 1000), 1)).encode("ascii")
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        if not tag_keys:
+            self.command(b"SET", self._key(key), serialize(data), b"PX", ttl_ms)
+            return
+        # Un seul aller-retour, atomique ; la durée d'un tag n'est jamais
+        # raccourcie (PEXPIRE ... GT exigerait Redis 7)
+        self.command(
+            b"EVAL",
+            SET_WITH_TAGS_SCRIPT,
+            str(1 + len(tag_keys)).encode("ascii"),
+            self._key(key),
+            *tag_keys,
+            serialize(data),
+            ttl_ms,
+        )
+
+    def delete(self, key: str):
+        self.command(b"DEL", self._key(key))
+
+    def clear(self):
+        cursor = b"0"
+        pattern = f"{self.namespace}:*".encode("utf-8")
+        while True:
+            cursor, keys = self.command(b"SCAN", cursor, b"MATCH", pattern, b"COUNT", b"500")
+            if keys:
+                self.command(b"DEL", *keys)
+            if cursor == b"0":
+                break
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        removed = 0
+        for tag in tags:
+            keys = self.command(b"SMEMBERS", self._tag_key(tag)) or []
+            if keys:
+                removed += self.command(b"DEL", *keys)
+            self.command(b"DEL", self._tag_key(tag))
+        return removed
+
+    def stats(self) -> Dict:
+        return {"backend": "redis", "server": f"{self.host}:{self.port}/{self.db}"}
+
+
+def create_backend(namespace: str, max_entries: int, max_bytes: int, config) -> CacheBackend:
+    """Backend choisi par CACHE_BACKEND (memory, sqlite, redis)"""
+    if config.CACHE_BACKEND == "sqlite":
+        return SQLiteBackend(config.CACHE_SQLITE_PATH, namespace, max_entries, max_bytes)
+    if config.CACHE_BACKEND == "redis":
+        return RedisBackend(config.CACHE_REDIS_URL, namespace)
+    return MemoryBackend(max_entries, max_bytes)
+
+
+class InvalidationBus:
+    """
+    Journal d'invalidations partagé par les workers d'un hôte (fichier SQLite).
+    Utile au backend mémoire, propre à chaque processus : chaque worker
+    rejoue les tags publiés par les autres quelques instants plus tard.
+    Chaque ligne porte l'origine du worker qui l'a publiée (pid et jeton
+    aléatoire, un pid pouvant être réutilisé) : un worker ne rejoue pas ses
+    propres invalidations, déjà appliquées localement.
+    """
+
+    RETENTION_SECONDS = 3600
+
+    def __init__(self, path: str, poll_seconds: float):
+        self.path = path
+        self.poll_seconds = poll_seconds
+        self._local = threading.local()
+        self._subscribers: Dict[str, Callable[[List[str]], None]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.origin = f"{os.getpid()}-{secrets.token_hex(8)}"
+        conn = self._connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS CACHE_INVALIDATIONS (
+                ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                NAMESPACE TEXT NOT NULL,
+                TAG TEXT NOT NULL,
+                CREATED REAL NOT NULL,
+                ORIGIN TEXT
+            )
+            """
+        )
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(CACHE_INVALIDATIONS)")]
+        if "ORIGIN" not in columns:
+            # Journal créé par une version précédente
+            try:
+                conn.execute("ALTER TABLE CACHE_INVALIDATIONS ADD COLUMN ORIGIN TEXT")
+            except sqlite3.OperationalError as e:
+                # Ajoutée entre-temps par un autre worker
+                if "duplicate column" not in str(e):
+                    raise
+        self._last_id = conn.execute(
+            "SELECT COALESCE(MAX(ID), 0) FROM CACHE_INVALIDATIONS"
+        ).fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def publish(self, namespace: str, tags: Iterable[str]):
+        now = time.time()
+        self._connection().executemany(
+            "INSERT INTO CACHE_INVALIDATIONS (NAMESPACE, TAG, CREATED, ORIGIN)"
+            " VALUES (?, ?, ?, ?)",
+            [(namespace, tag, now, self.origin) for tag in tags],
+        )
+
+    def subscribe(self, namespace: str, callback: Callable[[List[str]], None]):
+        with self._lock:
+            self._subscribers[namespace] = callback
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="cache-invalidations", daemon=True
+                )
+                self._thread.start()
+
+    def poll(self) -> List[Tuple[str, str]]:
+        """Invalidations publiées par les autres workers depuis le dernier appel"""
+        rows = self._connection().execute(
+            "SELECT ID, NAMESPACE, TAG, ORIGIN FROM CACHE_INVALIDATIONS"
+            " WHERE ID > ? ORDER BY ID",
+            (self._last_id,),
+        ).fetchall()
+        if rows:
+            self._last_id = rows[-1][0]
+        return [
+            (namespace, tag)
+            for _, namespace, tag, origin in rows
+            if origin != self.origin
+        ]
+
+    def _run(self):
+        polls = 0
+        while True:
+            time.sleep(self.poll_seconds)
+            try:
+                by_namespace: Dict[str, List[str]] = {}
+                for namespace, tag in self.poll():
+                    by_namespace.setdefault(namespace, []).append(tag)
+                with self._lock:
+                    subscribers = dict(self._subscribers)
+                for namespace, tags in by_namespace.items():
+                    if namespace in subscribers:
+                        subscribers[namespace](tags)
+                polls += 1
+                if polls % 600 == 0:
+                    self._connection().execute(
+                        "DELETE FROM CACHE_INVALIDATIONS WHERE CREATED < ?",
+                        (time.time() - self.RETENTION_SECONDS,),
+                    )
+            except Exception as e:
+                print(f"Error polling cache invalidations: {e}")
+
+
+_bus: Optional[InvalidationBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_invalidation_bus(config) -> InvalidationBus:
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = InvalidationBus(
+                config.CACHE_INVALIDATION_PATH, config.CACHE_INVALIDATION_POLL_SECONDS
+            )
+        return _bus
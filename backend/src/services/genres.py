@@ -0,0 +1,70 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.config import get_app_config
+
+
+class GenreDictionary:
+    """
+    Correspondance NOM <-> ID des genres, chargée une fois puis rafraîchie
+    en tâche de fond. La recherche filtre ainsi par ID_GENRE (indexé)
+    au lieu de comparer UPPER(G.NOM) film par film.
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.config = get_app_config()
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+        self.ready = False
+
+    def build(self, rows: Iterable[Tuple[int, str]]):
+        ids = {}
+        names = []
+        for genre_id, name in rows:
+            if name:
+                ids[name.strip().upper()] = int(genre_id)
+                names.append(name)
+        # Remplacement atomique : les lecteurs voient l'ancienne ou la nouvelle table
+        self._ids, self._names = ids, names
+        self.ready = True
+
+    async def load(self):
+        self.build(await self.repository.list_genres())
+
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    def resolve(self, names: Iterable[str]) -> Tuple[List[int], List[str]]:
+        """Retourne (ID connus triés, noms inconnus)"""
+        ids = set()
+        unknown = []
+        for name in names or []:
+            genre_id = self._ids.get(name.strip().upper())
+            if genre_id is None:
+                unknown.append(name)
+            else:
+                ids.add(genre_id)
+        return sorted(ids), unknown
+
+    async def _run(self):
+        while True:
+            try:
+                await self.load()
+            except Exception as e:
+                print(f"Error loading genres: {e}")
+            await asyncio.sleep(self.config.GENRES_REFRESH_SECONDS)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,75 +1,231 @@
 # backend/src/services/user.py
-from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from core.config import get_app_config
+from core.encoding import EncodedJSON, encode_json
 from db.repositories.movies import MoviesRepository
-from services.cache import CacheService
+from models.schemas.movie import MovieBase, MoviesPaginatedResponse
+from services.cache import get_cache
+from services.genres import GenreDictionary
+from services.suggestions import SuggestionService
+
+# Critères comparés tels quels par la recherche (les autres passent par UPPER)
+CASE_SENSITIVE_CRITERIA = {"cursor"}
+
+
+
+def film_tag(film_id: int) -> str:
+    return f"film:{film_id}"
 
 
 class MovieService:
     def __init__(self):
         self.repository = MoviesRepository()
-        self.cache = CacheService()
+        self.cache = get_cache("movies")
+        # Fiches et genres consultés en boucle : servis périmés pendant le
+        # rafraîchissement plutôt que rechargés par l'utilisateur suivant
+        config = get_app_config()
+        self.stale_minutes = config.CACHE_STALE_MINUTES
+        # Un export garde une session du pool pendant tout le transfert
+        self.export_batch_size = config.EXPORT_BATCH_SIZE
+        self.export_max_concurrent = config.EXPORT_MAX_CONCURRENT
+        self._active_exports = 0
+        self.suggestions = SuggestionService(self.repository)
+        self.genres = GenreDictionary(self.repository)
+
+    async def get_movie(self, movie_id: int) -> Optional[Dict]:
+        return await self.cache.get_or_load(
+            f"movie_{movie_id}",
+            lambda: self.repository.get_film_by_id(movie_id),
+            30,
+            tags=[film_tag(movie_id)],
+            stale_minutes=self.stale_minutes,
+        )
+
+    async def get_movie_json(self, movie_id: int) -> Optional[EncodedJSON]:
+        """Fiche déjà validée et encodée : les hits la renvoient telle quelle"""
 
-    def get_movie(self, movie_id: int) -> Optional[Dict]:
-        cache_key = f"movie_{movie_id}"
-        if cached := self.cache.get(cache_key):
-            return cached
+        async def load():
+            movie = await self.repository.get_film_by_id(movie_id)
+            return encode_json(movie, MovieBase) if movie else None
 
-        sql_result = self.repository.get_film_by_id(movie_id)
-        if sql_result:
-            self.cache.set(cache_key, sql_result, 30)
-        return sql_result
+        return await self.cache.get_or_load(
+            f"movie_json_{movie_id}",
+            load,
+            30,
+            tags=[film_tag(movie_id)],
+            stale_minutes=self.stale_minutes,
+        )
+
+    async def get_movies(self, movie_ids: List[int]) -> List[Dict]:
+        """Charge plusieurs films : cache d'abord, puis un seul aller-retour"""
+        movie_ids = list(dict.fromkeys(movie_ids))
+        movies = {}
+        missing = []
+        for movie_id in movie_ids:
+            if cached := await self.cache.get(f"movie_{movie_id}"):
+                movies[movie_id] = cached
+            else:
+                missing.append(movie_id)
+
+        if missing:
+            for film in await self.repository.get_films_by_ids(missing):
+                await self.cache.set(
+                    f"movie_{film['ID']}",
+                    film,
+                    30,
+                    tags=[film_tag(film["ID"])],
+                    stale_minutes=self.stale_minutes,
+                )
+                movies[film["ID"]] = film
+
+        return [movies[movie_id] for movie_id in movie_ids if movie_id in movies]
+
+    def _normalize_criteria(self, value: Any, field: str = "") -> Any:
+        # Même normalisation que le SQL : comparaisons via UPPER(), la casse
+        # n'importe pas ; seules les valeurs de liste sont nettoyées (strip)
+        # par le dépôt, TITRE/RESUME/LANGUE sont liés tels quels
+        if isinstance(value, str):
+            return value if field in CASE_SENSITIVE_CRITERIA else value.upper()
+        if isinstance(value, (list, tuple, set)):
+            return sorted({
+                self._normalize_criteria(item.strip() if isinstance(item, str) else item, field)
+                for item in value
+            })
+        return value
 
     def _create_cache_key(self, properties: Dict) -> str:
-        parameter_hashable = {}
+        """
+        Clé stable entre processus : empreinte SHA-256 des critères normalisés
+        (valeurs vides retirées, listes triées, texte en majuscules).
+        """
+        canonical = {}
         for key, value in properties.items():
-            if isinstance(value, list):
-                parameter_hashable[key] = tuple(sorted(value))
-            else:
-                parameter_hashable[key] = value
-        params_string = str((sorted(parameter_hashable.items())))
-        return f"film_search{hash(params_string)}"
-
-    def get_movie_trailer(self, movie_id: int) -> Optional[str]:
-        cache_key = f"trailer_{movie_id}"
-        if cached := self.cache.get(cache_key):
-            return cached
-
-        result = self.repository.get_trailer_by_id(movie_id)
-        if result:
-            self.cache.set(cache_key, result, 30)
-        return result
+            value = self._normalize_criteria(value, key)
+            if value in (None, "", []):
+                continue
+            canonical[key] = value
+        payload = json.dumps(
+            canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        )
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+        return f"film_search_{digest}"
+
+    async def get_movie_trailer(self, movie_id: int) -> Optional[str]:
+        return await self.cache.get_or_load(
+            f"trailer_{movie_id}",
+            lambda: self.repository.get_trailer_by_id(movie_id),
+            30,
+            tags=[film_tag(movie_id)],
+            stale_minutes=self.stale_minutes,
+        )
+
+    def _resolve_genres(self, search_params: Dict) -> Dict:
+        """
+        Résout les noms de genres en ID avant la requête SQL. Les noms absents
+        du dictionnaire (genre ajouté depuis le dernier rafraîchissement, ou
+        inexistant) restent filtrés par nom : la base tranche.
+        """
+        if not self.genres.ready:
+            return search_params
+        search_params = dict(search_params)
+        inclus, unknown_inclus = self.genres.resolve(search_params.pop("GENRES_INCLUS", None))
+        exclus, unknown_exclus = self.genres.resolve(search_params.pop("GENRES_EXCLUS", None))
+        search_params["GENRE_IDS_INCLUS"] = inclus
+        search_params["GENRE_IDS_EXCLUS"] = exclus
+        search_params["GENRES_INCLUS"] = unknown_inclus
+        search_params["GENRES_EXCLUS"] = unknown_exclus
+        return search_params
+
+    async def _search(self, search_params: Dict) -> Dict:
+        return await self.repository.search_films(self._resolve_genres(search_params))
+
+    def acquire_export(self) -> bool:
+        """Réserve un créneau d'export sans attendre ; False si tous sont pris"""
+        if self._active_exports >= self.export_max_concurrent:
+            return False
+        self._active_exports += 1
+        return True
+
+    def release_export(self):
+        self._active_exports -= 1
 
-    def search_movies(self, properties: Dict) -> List[Dict]:
+    async def export_movies(self, properties) -> AsyncIterator[List[Dict]]:
+        """
+        Tous les films correspondant aux critères (pagination ignorée), par
+        lots lus à la demande. Ni cache ni liste complète en mémoire.
+        L'appelant doit détenir un créneau (acquire_export).
+        """
+        search_params = self._resolve_genres(properties.dict())
+        batches = self.repository.stream_films(search_params, self.export_batch_size)
+        try:
+            async for batch in batches:
+                yield batch
+        finally:
+            # Client parti en cours de route : curseur et session rendus tout de suite
+            await batches.aclose()
+
+    async def search_movies(self, properties: Dict) -> List[Dict]:
         search_params = properties.dict()
         cache_key = self._create_cache_key(search_params)
-        cache_result = self.cache.get(cache_key)
-        if cache_result:
-            return cache_result
-        result = self.repository.search_films(properties.dict())
+        result = await self.cache.get_or_load(
+            cache_key, lambda: self._search(search_params), 30
+        )
         if not result:
             return []
-        self.cache.set(cache_key, result, 30)
 
         return result
 
-    def get_suggestions(self, term: str) -> List[Dict]:
-        result = self.repository.get_suggestion(term)
+    async def search_movies_json(self, properties: Dict) -> Optional[EncodedJSON]:
+        """Page de résultats encodée une fois puis servie depuis le cache"""
+        search_params = properties.dict()
+
+        async def load():
+            result = await self._search(search_params)
+            return encode_json(result, MoviesPaginatedResponse) if result else None
+
+        return await self.cache.get_or_load(
+            self._create_cache_key(search_params) + "_json", load, 30
+        )
+
+    async def get_suggestions(self, term: str) -> List[Dict]:
+        if self.suggestions.films.ready:
+            return [
+                {"ID": film_id, "TITRE": titre}
+                for film_id, titre in self.suggestions.films.search(term)
+            ]
+        result = await self.repository.get_suggestion(term)
         return result
 
-    def get_genres(self) -> List[str]:
-        result = self.repository.get_genres()
+    async def get_genres(self) -> List[str]:
+        if self.genres.ready:
+            return self.genres.names()
+        result = await self.cache.get_or_load(
+            "genres", self.repository.get_genres, 60, stale_minutes=self.stale_minutes
+        )
         return result
 
-    def get_movies_by_scenariste(self, nom_scenariste: str) -> List[Dict]:
-        films = self.repository.get_films_by_scenariste(nom_scenariste)
+    async def get_movies_by_scenariste(self, nom_scenariste: str) -> List[Dict]:
+        films = await self.repository.get_films_by_scenariste(nom_scenariste)
         print("Films found:", films)  # Log the result
         return films
 
-    def get_actor_suggestions(self, term: str) -> List[str]:
-        result = self.repository.get_actor_suggestions(term)
+    async def get_actor_suggestions(self, term: str) -> List[str]:
+        if self.suggestions.actors.ready:
+            return [
+                {"ID": actor_id, "NOM": nom}
+                for actor_id, nom in self.suggestions.actors.search(term)
+            ]
+        result = await self.repository.get_actor_suggestions(term)
         return result
 
-    def get_scenarist_suggestions(self, term: str) -> List[str]:
-        result = self.repository.get_scenariste_suggestions(term)
+    async def get_scenarist_suggestions(self, term: str) -> List[str]:
+        if self.suggestions.scenaristes.ready:
+            return [
+                {"ID": scenariste_id, "NOM": nom}
+                for scenariste_id, nom in self.suggestions.scenaristes.search(term)
+            ]
+        result = await self.repository.get_scenariste_suggestions(term)
         return result
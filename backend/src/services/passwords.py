@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from core.config import get_app_config
+
+# Schémas reconnus à la vérification ; tout autre que PASSWORD_SCHEME est
+# déprécié et réécrit à la prochaine connexion réussie. plaintext (mots de
+# passe historiques en clair) reste en dernier : il reconnaît toute valeur.
+KNOWN_SCHEMES = ("bcrypt", "pbkdf2_sha256", "plaintext")
+
+
+class HasherBusyError(Exception):
+    """File d'attente du hachage pleine : la requête doit être rejetée (503)"""
+
+
+class PasswordHasher:
+    """
+    Hachage et vérification des mots de passe hors de l'event loop, sur un
+    pool de threads dédié (bcrypt et pbkdf2 relâchent le GIL). Au-delà de
+    PASSWORD_HASH_QUEUE opérations en cours, les appels échouent aussitôt :
+    une rafale de connexions ne peut pas retenir tout le worker.
+    """
+
+    def __init__(self, scheme: str, rounds: int, workers: int, queue: int):
+        schemes = [scheme] + [s for s in KNOWN_SCHEMES if s != scheme]
+        settings = {"bcrypt__rounds": rounds} if scheme == "bcrypt" else {}
+        self.context = CryptContext(
+            schemes=schemes, default=scheme, deprecated="auto", **settings
+        )
+        self.max_pending = queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._pending = 0
+        self._rejected = 0
+        self._rehashed = 0
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise HasherBusyError("Password hashing queue is full")
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, stored: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Retourne (valide, nouveau hachage). Le nouveau hachage est fourni
+        quand le mot de passe stocké est en clair ou d'un schéma/coût
+        déprécié, pour être enregistré à la place de l'ancien.
+        """
+        if not stored:
+            # Même coût qu'une vraie vérification : pas d'énumération des courriels
+            await self._run(self.context.dummy_verify)
+            return False, None
+        valid, new_hash = await self._run(self.context.verify_and_update, password, stored)
+        if valid and new_hash:
+            self._rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> Dict:
+        return {
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "rejected": self._rejected,
+            "rehashed": self._rehashed,
+        }
+
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                config = get_app_config()
+                _hasher = PasswordHasher(
+                    config.PASSWORD_SCHEME,
+                    config.PASSWORD_BCRYPT_ROUNDS,
+                    config.PASSWORD_HASH_WORKERS,
+                    config.PASSWORD_HASH_QUEUE,
+                )
+    return _hasher
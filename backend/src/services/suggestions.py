@@ -0,0 +1,267 @@
+import asyncio
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from core.config import get_app_config
+
+# Les termes plus courts que N_GRAM sont résolus par les listes de préfixes
+# (début du nom, début de mot) ; les infixes ne sont cherchés, faute de mieux,
+# que parmi les SHORT_TERM_SCAN_LIMIT noms les plus courts. Les autres termes
+# passent par la liste de trigrammes la plus courte.
+N_GRAM = 3
+SHORT_TERM_CACHE_SIZE = 4096
+SHORT_TERM_SCAN_LIMIT = 20000
+PENDING_REBUILD_THRESHOLD = 10000
+
+
+class _Snapshot(NamedTuple):
+    ids: List[int]
+    names: List[str]
+    upper: List[str]
+    grams: Dict[str, array]
+    prefixes: Dict[str, array]
+    word_starts: Dict[str, array]
+
+
+def _grams(text: str) -> Iterable[str]:
+    return {text[i : i + N_GRAM] for i in range(len(text) - N_GRAM + 1)}
+
+
+def _short_prefixes(word: str) -> Iterable[str]:
+    return {word[:n] for n in range(1, min(len(word), N_GRAM - 1) + 1)}
+
+
+def _post(index: Dict[str, array], key: str, rank: int):
+    postings = index.get(key)
+    if postings is None:
+        postings = index[key] = array("I")
+    postings.append(rank)
+
+
+def _scan(snapshot: _Snapshot, candidates: Iterable[int], term: str, limit: int):
+    """Répartit les candidats par catégorie, au plus `limit` par catégorie"""
+    buckets: Tuple[List[int], ...] = ([], [], [])
+    for rank in candidates:
+        bucket = _match_rank(snapshot.upper[rank], term)
+        if bucket is None:
+            continue
+        if len(buckets[bucket]) < limit:
+            buckets[bucket].append(rank)
+        if len(buckets[0]) >= limit:
+            break
+    return buckets
+
+
+def _match_rank(upper: str, term: str) -> Optional[int]:
+    """Même classement que les requêtes SQL : préfixe, début de mot, infixe"""
+    if upper.startswith(term):
+        return 0
+    if " " + term in upper:
+        return 1
+    if term in upper:
+        return 2
+    return None
+
+
+class SuggestionIndex:
+    """
+    Index en mémoire pour l'autocomplétion d'un ensemble (ID, NOM).
+    Les entrées sont rangées par (LENGTH(NOM), NOM) : le premier résultat
+    trouvé dans chaque catégorie est donc déjà le mieux classé.
+    """
+
+    def __init__(self):
+        self._snapshot = _Snapshot([], [], [], {}, {}, {})
+        self._pending: Dict[int, Tuple[str, str]] = {}
+        self._short_terms: Dict[Tuple[str, int], List[Tuple[int, str]]] = {}
+        self.max_id = 0
+        self.ready = False
+
+    def build(self, rows: Iterable[Tuple[int, str]]):
+        """Reconstruit l'index complet à partir de lignes (ID, NOM)"""
+        entries = {}
+        for entry_id, name in rows:
+            if name:
+                entries[int(entry_id)] = name
+        ordered = sorted(
+            entries.items(), key=lambda item: (len(item[1]), item[1].upper(), item[0])
+        )
+
+        ids = [entry_id for entry_id, _ in ordered]
+        names = [name for _, name in ordered]
+        upper = [name.upper() for name in names]
+        grams: Dict[str, array] = {}
+        prefixes: Dict[str, array] = {}
+        word_starts: Dict[str, array] = {}
+        for rank, name in enumerate(upper):
+            for gram in _grams(name):
+                _post(grams, gram, rank)
+            for prefix in _short_prefixes(name):
+                _post(prefixes, prefix, rank)
+            starts = set()
+            for word in name.split(" ")[1:]:
+                starts.update(_short_prefixes(word))
+            for start in starts:
+                _post(word_starts, start, rank)
+
+        self._snapshot = _Snapshot(ids, names, upper, grams, prefixes, word_starts)
+        self._pending = {}
+        self._short_terms = {}
+        self.max_id = max(ids, default=0)
+        self.ready = True
+
+    def add(self, rows: Iterable[Tuple[int, str]]):
+        """
+        Ajout incrémental : les nouvelles entrées sont parcourues à part
+        jusqu'à la prochaine reconstruction.
+        """
+        for entry_id, name in rows:
+            if name:
+                self._pending[int(entry_id)] = (name, name.upper())
+                self.max_id = max(self.max_id, int(entry_id))
+        self._short_terms = {}
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return len(self._pending) > PENDING_REBUILD_THRESHOLD
+
+    def rows(self) -> List[Tuple[int, str]]:
+        snapshot = self._snapshot
+        rows = list(zip(snapshot.ids, snapshot.names))
+        rows.extend((entry_id, name) for entry_id, (name, _) in self._pending.items())
+        return rows
+
+    def __len__(self) -> int:
+        return len(self._snapshot.ids) + len(self._pending)
+
+    def search(self, term: str, limit: int = 5) -> List[Tuple[int, str]]:
+        """Retourne jusqu'à `limit` couples (ID, NOM) correspondant à term"""
+        term = term.strip().upper()
+        if not term or limit <= 0:
+            return []
+
+        short = len(term) < N_GRAM
+        if short and (term, limit) in self._short_terms:
+            return self._short_terms[(term, limit)]
+
+        snapshot = self._snapshot
+        if short:
+            buckets = self._search_short(snapshot, term, limit)
+        else:
+            postings = [snapshot.grams.get(gram) for gram in _grams(term)]
+            candidates = [] if None in postings else min(postings, key=len)
+            buckets = _scan(snapshot, candidates, term, limit)
+
+        matches = [
+            (bucket, len(snapshot.upper[rank]), snapshot.upper[rank], snapshot.ids[rank])
+            for bucket, ranks in enumerate(buckets)
+            for rank in ranks
+        ]
+        names = {snapshot.ids[rank]: snapshot.names[rank] for ranks in buckets for rank in ranks}
+        for entry_id, (name, upper) in self._pending.items():
+            bucket = _match_rank(upper, term)
+            if bucket is not None:
+                matches.append((bucket, len(upper), upper, entry_id))
+                names[entry_id] = name
+
+        matches.sort()
+        seen = set()
+        result = []
+        for _, _, _, entry_id in matches:
+            if entry_id in seen:
+                continue
+            seen.add(entry_id)
+            result.append((entry_id, names[entry_id]))
+            if len(result) >= limit:
+                break
+
+        if short:
+            if len(self._short_terms) >= SHORT_TERM_CACHE_SIZE:
+                self._short_terms = {}
+            self._short_terms[(term, limit)] = result
+        return result
+
+    @staticmethod
+    def _search_short(snapshot: _Snapshot, term: str, limit: int):
+        """
+        Préfixes et débuts de mot lus directement dans leurs listes (déjà
+        classées) ; l'infixe n'est parcouru que s'il manque des résultats.
+        """
+        head = list(snapshot.prefixes.get(term, ())[:limit])
+        words: List[int] = []
+        for rank in snapshot.word_starts.get(term, ()):
+            if len(words) >= limit:
+                break
+            if not snapshot.upper[rank].startswith(term):
+                words.append(rank)
+        infix: List[int] = []
+        if len(head) + len(words) < limit:
+            scanned = range(min(len(snapshot.upper), SHORT_TERM_SCAN_LIMIT))
+            infix = _scan(snapshot, scanned, term, limit)[2]
+        return head, words, infix
+
+
+class SuggestionService:
+    """
+    Charge au démarrage les index de titres, d'acteurs et de scénaristes,
+    puis les tient à jour en tâche de fond (nouveaux ID périodiquement,
+    rechargement complet plus rarement).
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.config = get_app_config()
+        self.films = SuggestionIndex()
+        self.actors = SuggestionIndex()
+        self.scenaristes = SuggestionIndex()
+        self._task: Optional[asyncio.Task] = None
+
+    def _sources(self):
+        return (
+            (self.films, self.repository.list_film_titles),
+            (self.actors, self.repository.list_actor_names),
+            (self.scenaristes, self.repository.list_scenariste_names),
+        )
+
+    async def load(self):
+        """Chargement complet des trois index"""
+        for index, fetch in self._sources():
+            rows = await fetch()
+            await asyncio.to_thread(index.build, rows)
+
+    async def refresh(self):
+        """Ajoute les entrées créées depuis le dernier chargement"""
+        for index, fetch in self._sources():
+            rows = await fetch(after_id=index.max_id)
+            if rows:
+                index.add(rows)
+            if index.needs_rebuild:
+                await asyncio.to_thread(index.build, index.rows())
+
+    async def _run(self):
+        refresh = self.config.SUGGESTIONS_REFRESH_SECONDS
+        reload_every = max(1, self.config.SUGGESTIONS_RELOAD_SECONDS // refresh)
+        cycle = 0
+        while True:
+            try:
+                if cycle % reload_every == 0:
+                    await self.load()
+                else:
+                    await self.refresh()
+            except Exception as e:
+                print(f"Error refreshing suggestion indexes: {e}")
+            cycle += 1
+            await asyncio.sleep(refresh)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,30 +1,49 @@
 # backend/src/services/user.py
-from typing import Tuple, Dict, Optional
+from typing import Tuple, Dict, List, Optional
+from core.config import get_app_config
 from db.repositories.users import UserRepository
-from services.cache import CacheService
+from services.cache import get_cache
+from services.passwords import get_password_hasher
+
+
+def client_tag(email: str) -> str:
+    return f"client:{email}"
 
 
 class UserService:
     def __init__(self):
         self.repository = UserRepository()
-        self.cache = CacheService()
+        self.cache = get_cache("users")
+        self.hasher = get_password_hasher()
+        # Les écritures invalident le cache : la durée peut être longue
+        config = get_app_config()
+        self.cache_minutes = config.CACHE_PROFILE_MINUTES
+        self.rental_cost = config.RENTAL_COST
 
-    def authenticate(self, email: str, password: str) -> Tuple[Dict, bool]:
-        client = self.repository.get_by_email_password(email)
-        if client and client["MOT_DE_PASSE"] == password:
-            return client, True
-        return None, False
+    async def authenticate(self, email: str, password: str) -> Tuple[Dict, bool]:
+        """
+        Vérifie hors de l'event loop ; un mot de passe en clair ou d'un
+        schéma déprécié est réécrit avec le schéma courant.
+        Lève HasherBusyError si la file de hachage est pleine.
+        """
+        client = await self.repository.get_by_email_password(email)
+        valid, new_hash = await self.hasher.verify(
+            password, client["MOT_DE_PASSE"] if client else None
+        )
+        if not valid:
+            return None, False
+        if new_hash:
+            await self.repository.update_password_hash(email, new_hash)
+        return client, True
 
-    def get_profile(self, email: str) -> Optional[Dict]:
-        cache_key = f"client_{email}"
-        if cached := self.cache.get(cache_key):
-            return cached
+    async def get_profile(self, email: str) -> Optional[Dict]:
+        async def load():
+            sql_result = await self.repository.get_by_email(email)
+            return self.sql_to_ClientBase(sql_result) if sql_result else None
 
-        sql_result = self.repository.get_by_email(email)
-        result = self.sql_to_ClientBase(sql_result) if sql_result else None
-        if result:
-            self.cache.set(cache_key, result, 30)
-        return result
+        return await self.cache.get_or_load(
+            f"client_{email}", load, self.cache_minutes, tags=[client_tag(email)]
+        )
 
     def sql_to_ClientBase(self, sql_result: Dict) -> Dict:
         return {
@@ -41,36 +60,44 @@ class UserService:
             "credits": sql_result["CREDITS"],
         }
     
-    def update_profile(self, email: str, updated_data: dict) -> bool:
-        existing_user = self.repository.get_by_email(email)
+    async def update_profile(self, email: str, updated_data: dict) -> bool:
+        existing_user = await self.repository.get_by_email(email)
         if not existing_user:
             return False
         current_profile = self.sql_to_ClientBase(existing_user)
         merged_data = {**current_profile, **updated_data} 
-        return self.repository.update_profile(email, merged_data)
+        success = await self.repository.update_profile(email, merged_data)
+        await self.cache.invalidate(client_tag(email))
+        return success
 
 
-    def register_client(self, user) -> bool:
-        return self.repository.create(user)
+    async def register_client(self, user) -> Optional[int]:
+        """Hache le mot de passe et crée le client ; retourne son ID ou None"""
+        password_hash = await self.hasher.hash(user.mot_de_passe)
+        return await self.repository.create(user.copy(update={"mot_de_passe": password_hash}))
 
-    def redeem_credits(self, email: str) -> bool:
-        return self.repository.redeem_credits(email)
+    async def rent_film(self, email: str, film_id: int) -> Optional[int]:
+        """Débite RENTAL_COST et loue le film ; retourne le solde restant ou None"""
+        credits = await self.repository.rent_film(email, film_id, self.rental_cost)
+        if credits is not None:
+            await self.cache.invalidate(client_tag(email))
+        return credits
     
-    def link_film_to_client(self, email: str, film_id: int) -> bool:
-        """
-        1) Get the client from email
-        2) Insert a row (ID_FILM, ID_CLIENT) into FILM_CLIENT table
-        """
-        client = self.repository.get_by_email(email)
-        if not client:
-            return False
+    async def rent_films(self, email: str, film_ids: List[int]) -> Optional[Dict]:
+        """Loue un panier de films (déjà loués ignorés) en une transaction"""
+        result = await self.repository.rent_films(email, film_ids, self.rental_cost)
+        if result is not None and result["rented"]:
+            await self.cache.invalidate(client_tag(email))
+        return result
 
-        client_id = client["ID"]
-        return self.repository.link_film_to_client(client_id, film_id)
-    
-    def get_rented_movies(self, email: str) -> list:
-        return self.repository.get_rented_movies(email)
+    async def get_rented_movies(self, email: str) -> list:
+        return await self.cache.get_or_load(
+            f"rented_{email}",
+            lambda: self.repository.get_rented_movies(email),
+            self.cache_minutes,
+            tags=[client_tag(email)],
+        )
 
-    def get_user_credits(self, email: str) -> int:
-        return self.repository.get_user_credits(email)
+    async def get_user_credits(self, email: str) -> int:
+        return await self.repository.get_user_credits(email)
 